@@ -11,21 +11,208 @@ https://google.github.io/adk-docs/agents/multi-agents/
 """
 
 import asyncio
+import heapq
 import logging
+import math
+import time
+import traceback
+import weakref
+from collections import OrderedDict
 from datetime import datetime
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Tuple
 from uuid import uuid4
 
 from google.adk.agents import BaseAgent, LlmAgent, SequentialAgent, ParallelAgent, LoopAgent
 from google.adk.agents.invocation_context import InvocationContext
 from google.adk.events import Event, EventActions
 from google.adk.models.lite_llm import LiteLlm
+from google.adk.runners import Runner
+from google.adk.sessions import InMemorySessionService
 from google.genai import types
 
 from src.utils.adk_session_manager import get_adk_session_manager
+from src.utils.config_manager import ConfigManager
 
 logger = logging.getLogger(__name__)
 
+# Fan-Out智能体数量超过该阈值时，先分组并发执行并局部聚合，再做最终聚合
+_FANOUT_BUCKET_THRESHOLD = 8
+
+# 解散讨论组时需要清理的ADK父子关系属性
+_PARENT_ATTRS = (
+    '_parent_agent',    # ADK标准父智能体属性
+    'parent_agent',     # 可能的别名
+    '_adk_parent',      # ADK内部父引用
+    '_parent',          # 通用父引用
+)
+
+# 解散讨论组时需要清理的ADK内部状态属性
+_ADK_INTERNAL_ATTRS = (
+    '_sub_agents',      # 子智能体列表
+    '_discussion_id',   # 讨论组ID
+    '_adk_context',     # ADK上下文
+    '_adk_session',     # ADK会话
+)
+
+# 解散讨论组时需要保持的具身智能体重要状态（对下次滚动规划很重要）
+_PRESERVED_STATE_ATTRS = (
+    'satellite_id',           # 卫星ID（核心标识）
+    '_config',               # 配置信息
+    '_time_manager',         # 时间管理器
+    '_stk_manager',          # STK管理器
+    '_multi_agent_system',   # 多智能体系统引用
+    'memory_module',         # 记忆模块
+    '_task_history',         # 任务历史
+    '_resource_status',      # 资源状态
+    '_performance_metrics',  # 性能指标
+    '_collaboration_history', # 协作历史
+    '_visibility_calculator', # 可见性计算器
+    '_discussion_groups',    # 讨论组历史
+)
+
+# 解散讨论组时需要重置的临时执行状态：(属性名, 默认值工厂)，每个智能体各自得到新的默认值
+_TEMPORARY_STATE_RESETS = (
+    ('_last_response', lambda: None),     # 清理上次响应
+    ('_current_iteration', int),          # 重置迭代计数
+    ('_iteration_results', list),         # 清理迭代结果
+    ('_discussion_state', lambda: None),  # 清理讨论状态
+)
+
+
+# Gather聚合器指令模板（仅任务描述随讨论组变化）
+_GATHER_INSTRUCTION_TMPL = """
+你是专业的结果聚合器，负责收集和深度分析并发执行的结果。
+
+任务描述: {task_description}
+
+请执行以下专业分析步骤：
+
+1. **结果收集与整理**：
+   - 收集所有卫星智能体的执行结果
+   - 整理各智能体的分析数据和指标
+
+2. **专业指标计算**：
+   - 计算系统级GDOP（几何精度因子，越小越好，理想值<2.0）
+   - 评估整体鲁棒性评分
+   - 分析覆盖率和任务可行性
+   - 计算资源利用效率
+
+3. **深度分析报告**：
+   - 分析结果的一致性和质量
+   - 识别潜在的系统瓶颈
+   - 评估任务执行风险
+   - 提供优化建议
+
+4. **结构化输出**：
+   请以以下格式输出分析结果：
+
+   ## 系统级指标
+   - 整体GDOP: [数值，越小越好，理想值<2.0]
+   - 系统鲁棒性: [0-100评分]
+   - 覆盖率: [百分比]
+   - 资源利用率: [百分比]
+
+   ## 详细分析
+   [具体分析内容]
+
+   ## 优化建议
+   [改进建议]
+
+将聚合结果保存到session.state['fanout_gather_result']中。
+"""
+
+# 分组局部聚合器指令模板（大规模Fan-Out时每个分组先做局部汇总）
+_PARTIAL_GATHER_INSTRUCTION_TMPL = """
+你是分组局部聚合器，负责汇总本组{agent_count}个卫星智能体的执行结果。
+
+任务描述: {task_description}
+
+请整理本组各卫星智能体的分析数据，给出本组的GDOP、鲁棒性、覆盖率和资源利用率的汇总结果，
+并列出组内的主要问题，供最终聚合器进一步分析。
+
+将局部汇总结果保存到session.state['{output_key}']中。
+"""
+
+# 分组Fan-Out时最终聚合器的输入说明（{partials}为各分组局部汇总的状态注入占位符）
+_FINAL_GATHER_PARTIALS_TMPL = """
+本次Fan-Out按分组执行，各分组的局部聚合器已完成组内汇总。
+请基于以下{bucket_count}份分组局部汇总结果完成上述分析（无需再逐个收集卫星智能体结果）：
+
+{partials}
+"""
+
+# 迭代优化质量检查器指令模板（仅任务描述随讨论组变化）
+_QUALITY_CHECKER_INSTRUCTION_TMPL = """
+你是专业的质量检查和优化智能体，负责深度评估迭代结果并决定是否继续优化。
+
+任务描述: {task_description}
+
+请执行以下专业评估步骤：
+
+1. **多维度质量评估**：
+   - GDOP质量评分（0-1）
+   - 鲁棒性评分（0-1）
+   - 覆盖率评分（0-1）
+   - 资源效率评分（0-1）
+
+2. **综合质量计算**：
+   - 计算加权综合质量分数
+   - 权重：GDOP(0.3) + 鲁棒性(0.3) + 覆盖率(0.2) + 效率(0.2)
+
+3. **迭代决策逻辑**：
+   - 如果综合质量分数 >= 0.85，设置escalate=True停止迭代
+   - 如果分数 < 0.6，提供具体改进建议
+   - 如果0.6 <= 分数 < 0.85，进行微调优化
+
+4. **专业改进建议**：
+   - 基于具体指标提供优化方向
+   - 识别性能瓶颈和改进点
+   - 提供量化的改进目标
+
+请以结构化格式输出评估结果：
+
+## 质量评估结果
+- GDOP评分: [0-1]
+- 鲁棒性评分: [0-1]
+- 覆盖率评分: [0-1]
+- 效率评分: [0-1]
+- **综合质量分数: [0-1]**
+
+## 迭代决策
+- 是否继续迭代: [是/否]
+- 决策理由: [具体原因]
+
+## 改进建议
+[具体的优化建议]
+
+将结果保存到session.state['iterative_result']中。
+如果需要停止迭代，设置session.state['should_escalate'] = True。
+"""
+
+
+class _SatelliteLogAdapter(logging.LoggerAdapter):
+    """为日志消息统一添加卫星ID前缀，仅在对应级别启用时才拼接"""
+
+    def process(self, msg, kwargs):
+        return f"[{self.extra['satellite_id']}] {msg}", kwargs
+
+
+def _cancel_lifecycle_monitor(task_ref: list):
+    """讨论系统被回收时取消生命周期监控任务（事件循环已关闭时跳过）"""
+    task = task_ref[0]
+    if task is not None and not task.done() and not task.get_loop().is_closed():
+        task.cancel()
+        logger.info("🛑 生命周期监控已停止")
+
+
+def _extract_text(event) -> str:
+    """提取事件内容中的全部文本片段"""
+    content = event.content
+    if not content or not content.parts:
+        return ""
+    return "".join(part.text for part in content.parts if getattr(part, 'text', None))
+
+
 class ADKOfficialDiscussionSystem(LlmAgent):
     """
     ADK官方多智能体讨论系统
@@ -36,8 +223,6 @@ class ADKOfficialDiscussionSystem(LlmAgent):
 
     def __init__(self, model: str = "deepseek/deepseek-chat"):
         # 🔧 修复：使用配置文件中的API密钥配置LiteLLM
-        from src.utils.config_manager import ConfigManager
-
         # 获取LLM配置
         config_manager = ConfigManager()
         llm_config = config_manager.config.get('llm', {})  # 直接访问config中的llm配置
@@ -68,13 +253,18 @@ class ADKOfficialDiscussionSystem(LlmAgent):
 """
         )
         
-        # 活跃讨论组
-        self._active_discussions: Dict[str, BaseAgent] = {}
+        # 活跃讨论组（按创建顺序排列，最早创建的最先过期）
+        self._active_discussions: "OrderedDict[str, BaseAgent]" = OrderedDict()
+
+        # 讨论组过期时间最小堆：(单调时钟截止时间, 讨论ID)
+        self._expiry_heap: List[Tuple[float, str]] = []
         
-        # 生命周期监控
+        # 生命周期监控（任务引用同时保存在独立列表中，供finalize回调使用而不引用self）
         self._lifecycle_monitor_task = None
+        self._lifecycle_monitor_task_ref = [None]
         self._auto_cleanup_enabled = True
         self._max_discussion_lifetime = 600  # 10分钟最大生命周期
+        weakref.finalize(self, _cancel_lifecycle_monitor, self._lifecycle_monitor_task_ref)
         
         logger.info("✅ ADK官方讨论系统初始化完成")
 
@@ -87,18 +277,23 @@ class ADKOfficialDiscussionSystem(LlmAgent):
             # 检查是否有运行的事件循环
             loop = asyncio.get_running_loop()
             if self._lifecycle_monitor_task is None or self._lifecycle_monitor_task.done():
-                self._lifecycle_monitor_task = loop.create_task(self._lifecycle_monitor())
+                self._set_lifecycle_monitor_task(loop.create_task(self._lifecycle_monitor(weakref.ref(self))))
                 logger.info("✅ ADK官方讨论系统生命周期监控已启动")
         except RuntimeError:
             # 没有运行的事件循环（如在Flask同步环境中）
             logger.info("⚠️ 没有运行的事件循环，生命周期监控将在需要时启动")
-            self._lifecycle_monitor_task = None
+            self._set_lifecycle_monitor_task(None)
+
+    def _set_lifecycle_monitor_task(self, task):
+        """记录生命周期监控任务，并同步到finalize回调持有的引用"""
+        self._lifecycle_monitor_task = task
+        self._lifecycle_monitor_task_ref[0] = task
 
     async def start_lifecycle_monitoring_async(self):
         """在异步环境中启动生命周期监控"""
         try:
             if self._lifecycle_monitor_task is None or self._lifecycle_monitor_task.done():
-                self._lifecycle_monitor_task = asyncio.create_task(self._lifecycle_monitor())
+                self._set_lifecycle_monitor_task(asyncio.create_task(self._lifecycle_monitor(weakref.ref(self))))
                 logger.info("✅ ADK官方讨论系统生命周期监控已启动（异步模式）")
                 return True
             return False
@@ -106,12 +301,39 @@ class ADKOfficialDiscussionSystem(LlmAgent):
             logger.error(f"❌ 启动生命周期监控失败: {e}")
             return False
 
-    async def _lifecycle_monitor(self):
-        """生命周期监控任务"""
+    def close(self):
+        """显式停止生命周期监控，不依赖垃圾回收时机"""
+        _cancel_lifecycle_monitor(self._lifecycle_monitor_task_ref)
+        self._set_lifecycle_monitor_task(None)
+
+    @staticmethod
+    async def _lifecycle_monitor(system_ref: "weakref.ref[ADKOfficialDiscussionSystem]"):
+        """
+        生命周期监控任务
+
+        只持有讨论系统的弱引用，睡眠期间不保留强引用，
+        这样监控运行时讨论系统仍可被回收并触发finalize；系统被回收后监控自动退出
+        """
+        # 最大生命周期已在创建讨论组时折算进截止时间，循环中无需再读取
         try:
-            while self._auto_cleanup_enabled:
-                await asyncio.sleep(60)  # 每分钟检查一次
-                await self._cleanup_expired_discussions()
+            while True:
+                system = system_ref()
+                if system is None or not system._auto_cleanup_enabled:
+                    break
+                # 睡眠到最近的过期时间；没有活跃讨论组时每分钟检查一次
+                expiry_heap = system._expiry_heap
+                if expiry_heap:
+                    delay = max(0.0, expiry_heap[0][0] - time.monotonic())
+                else:
+                    delay = 60
+                system = None
+                await asyncio.sleep(delay)
+
+                system = system_ref()
+                if system is None:
+                    break
+                await system._cleanup_expired_discussions()
+                system = None
         except asyncio.CancelledError:
             logger.info("🛑 生命周期监控已停止")
         except Exception as e:
@@ -120,17 +342,26 @@ class ADKOfficialDiscussionSystem(LlmAgent):
     async def _cleanup_expired_discussions(self):
         """清理过期的讨论组"""
         try:
-            current_time = datetime.now()
+            current_time = time.monotonic()
             expired_discussions = []
             
-            for discussion_id, discussion_agent in self._active_discussions.items():
-                creation_time = getattr(discussion_agent, '_creation_time', current_time)
-                if (current_time - creation_time).total_seconds() > self._max_discussion_lifetime:
+            # 只弹出已到期的堆顶条目；已提前完成的讨论组在此惰性跳过
+            expiry_heap = self._expiry_heap
+            while expiry_heap and expiry_heap[0][0] <= current_time:
+                _, discussion_id = heapq.heappop(expiry_heap)
+                if discussion_id in self._active_discussions:
                     expired_discussions.append(discussion_id)
             
-            for discussion_id in expired_discussions:
-                await self.complete_discussion(discussion_id)
-                logger.info(f"🧹 已清理过期讨论组: {discussion_id}")
+            # 过期讨论组的解散互不依赖，一次性并发完成
+            results = await asyncio.gather(
+                *(self.complete_discussion(discussion_id) for discussion_id in expired_discussions),
+                return_exceptions=True
+            )
+            for discussion_id, result in zip(expired_discussions, results):
+                if isinstance(result, Exception):
+                    logger.error(f"❌ 清理过期讨论组失败: {discussion_id}, 错误: {result}")
+                else:
+                    logger.info(f"🧹 已清理过期讨论组: {discussion_id}")
                 
         except Exception as e:
             logger.error(f"❌ 清理过期讨论组失败: {e}")
@@ -154,12 +385,23 @@ class ADKOfficialDiscussionSystem(LlmAgent):
             讨论ID
         """
         try:
-            from google.adk.agents import ParallelAgent, SequentialAgent, LlmAgent
-
             logger.info(f"🔄 使用ADK官方模式创建讨论组: {pattern_type}")
-            logger.info(f"   参与智能体: {[agent.name for agent in participating_agents]}")
+            # 一次性提取参与智能体的元数据视图，后续日志、验证和重置只使用这些列表
+            agent_names = [agent.name for agent in participating_agents]
+            agent_dicts = [agent.__dict__ for agent in participating_agents]
+            has_satellite_id = [hasattr(agent, 'satellite_id') for agent in participating_agents]
+
+            logger.info(f"   参与智能体: {agent_names}")
             logger.info(f"   任务描述: {task_description}")
 
+            if not participating_agents:
+                raise ValueError("讨论组至少需要一个参与智能体")
+
+            # 验证参与智能体都是具身卫星智能体（在任何清理副作用之前快速失败）
+            invalid_agents = [name for name, valid in zip(agent_names, has_satellite_id) if not valid]
+            if invalid_agents:
+                raise ValueError(f"智能体 {', '.join(invalid_agents)} 不是具身卫星智能体")
+
             # 确保生命周期监控已启动
             self._ensure_lifecycle_monitoring()
 
@@ -167,20 +409,12 @@ class ADKOfficialDiscussionSystem(LlmAgent):
             if self._lifecycle_monitor_task is None:
                 await self.start_lifecycle_monitoring_async()
 
-            # 检查并清理智能体的旧关系
-            await self._cleanup_agents_old_relationships(participating_agents)
-
-            # 强制重置智能体状态
-            await self._force_reset_agents(participating_agents)
+            # 检查并清理智能体的旧关系，同时强制重置智能体状态
+            self._reset_agents_for_new_discussion(agent_dicts)
 
             # 生成讨论组ID
             discussion_id = f"adk_official_{uuid4().hex[:8]}"
 
-            # 验证参与智能体都是具身卫星智能体
-            for agent in participating_agents:
-                if not hasattr(agent, 'satellite_id'):
-                    raise ValueError(f"智能体 {agent.name} 不是具身卫星智能体")
-
             # # 按照ADK官方模式创建讨论组智能体
             # if pattern_type == "parallel_fanout":
             #     # Parallel Fan-Out/Gather Pattern - ADK官方推荐模式
@@ -205,11 +439,18 @@ class ADKOfficialDiscussionSystem(LlmAgent):
                 discussion_id, participating_agents, task_description
             )
 
-            # 设置创建时间
-            discussion_agent._creation_time = datetime.now()
+            # 设置创建时间（过期判断使用单调时钟，不受系统时间调整影响；
+            # 墙上时间仅以ISO字符串形式保留，用于Session元数据展示）
+            creation_monotonic = time.monotonic()
+            discussion_agent._creation_monotonic = creation_monotonic
+            discussion_agent._creation_iso = datetime.now().isoformat()
 
             # 注册讨论组
             self._active_discussions[discussion_id] = discussion_agent
+            heapq.heappush(
+                self._expiry_heap,
+                (creation_monotonic + self._max_discussion_lifetime, discussion_id)
+            )
 
             # 注册到ADK Session管理器
             session_manager = get_adk_session_manager()
@@ -218,7 +459,7 @@ class ADKOfficialDiscussionSystem(LlmAgent):
                 'pattern_type': pattern_type,
                 'agent_count': len(participating_agents),
                 'task_description': task_description,
-                'creation_time': datetime.now().isoformat()
+                'creation_time': discussion_agent._creation_iso
             }
             session_manager.add_adk_discussion(discussion_id, discussion_info)
 
@@ -277,10 +518,6 @@ class ADKOfficialDiscussionSystem(LlmAgent):
             logger.info(f"   任务: {task_description}")
 
             # 🔧 修复：使用ADK官方文档的正确方式
-            from google.adk.runners import Runner
-            from google.adk.sessions import InMemorySessionService
-            from google.genai import types
-
             # 创建会话服务
             session_service = InMemorySessionService()
 
@@ -322,12 +559,15 @@ class ADKOfficialDiscussionSystem(LlmAgent):
 
             # 🔧 修复：使用正确的run_async API
             response_events = []
+            response_texts = []
             async for event in runner.run_async(
                 user_id=user_id,
                 session_id=session_id,
                 new_message=user_message_content
             ):
+                text = _extract_text(event)
                 response_events.append(event)
+                response_texts.append(text)
 
                 # 基础事件日志
                 logger.info(f"📝 收到事件: {event.author} - {len(str(event.content)) if event.content else 0} 字符")
@@ -335,124 +575,105 @@ class ADKOfficialDiscussionSystem(LlmAgent):
                 # 🔧 新增：详细的迭代指标日志输出
                 if event.author and "QualityChecker" in event.author:
                     # 这是质量检查器的响应，包含迭代指标
-                    if event.content and event.content.parts:
-                        quality_response = ""
-                        for part in event.content.parts:
-                            if hasattr(part, 'text') and part.text:
-                                quality_response += part.text
-
-                        if quality_response:
-                            logger.info(f"📊 质量检查器迭代指标分析:")
-
-                            # 提取关键指标
-                            lines = quality_response.split('\n')
-                            for line in lines:
-                                line = line.strip()
-                                if any(keyword in line for keyword in ['GDOP评分', 'GDOP分数', 'gdop', 'GDOP']):
-                                    logger.info(f"   🎯 {line}")
-                                elif any(keyword in line for keyword in ['鲁棒性评分', '鲁棒性分数', '鲁棒性']):
-                                    logger.info(f"   🛡️ {line}")
-                                elif any(keyword in line for keyword in ['覆盖率评分', '覆盖率分数', '覆盖率']):
-                                    logger.info(f"   📡 {line}")
-                                elif any(keyword in line for keyword in ['效率评分', '效率分数', '效率']):
-                                    logger.info(f"   ⚡ {line}")
-                                elif any(keyword in line for keyword in ['综合质量分数', '综合分数', '总分']):
-                                    logger.info(f"   🏆 {line}")
-                                elif any(keyword in line for keyword in ['是否继续迭代', '迭代决策', '继续迭代']):
-                                    logger.info(f"   🔄 {line}")
-                                elif any(keyword in line for keyword in ['决策理由', '理由']):
-                                    logger.info(f"   💭 {line}")
-
-                            # 显示完整响应的前几行
-                            logger.info(f"📋 质量检查器完整响应摘要:")
-                            response_lines = quality_response.split('\n')[:8]
-                            for i, line in enumerate(response_lines):
-                                if line.strip():
-                                    logger.info(f"   {i+1}. {line.strip()}")
-
-                            if len(response_lines) > 8:
-                                logger.info(f"   ... (还有 {len(quality_response.split('\n')) - 8} 行)")
+                    quality_response = text
+                    if quality_response:
+                        logger.info(f"📊 质量检查器迭代指标分析:")
+
+                        # 提取关键指标
+                        lines = quality_response.split('\n')
+                        for line in lines:
+                            line = line.strip()
+                            if any(keyword in line for keyword in ['GDOP评分', 'GDOP分数', 'gdop', 'GDOP']):
+                                logger.info(f"   🎯 {line}")
+                            elif any(keyword in line for keyword in ['鲁棒性评分', '鲁棒性分数', '鲁棒性']):
+                                logger.info(f"   🛡️ {line}")
+                            elif any(keyword in line for keyword in ['覆盖率评分', '覆盖率分数', '覆盖率']):
+                                logger.info(f"   📡 {line}")
+                            elif any(keyword in line for keyword in ['效率评分', '效率分数', '效率']):
+                                logger.info(f"   ⚡ {line}")
+                            elif any(keyword in line for keyword in ['综合质量分数', '综合分数', '总分']):
+                                logger.info(f"   🏆 {line}")
+                            elif any(keyword in line for keyword in ['是否继续迭代', '迭代决策', '继续迭代']):
+                                logger.info(f"   🔄 {line}")
+                            elif any(keyword in line for keyword in ['决策理由', '理由']):
+                                logger.info(f"   💭 {line}")
+
+                        # 显示完整响应的前几行
+                        logger.info(f"📋 质量检查器完整响应摘要:")
+                        response_lines = quality_response.split('\n')[:8]
+                        for i, line in enumerate(response_lines):
+                            if line.strip():
+                                logger.info(f"   {i+1}. {line.strip()}")
+
+                        if len(response_lines) > 8:
+                            logger.info(f"   ... (还有 {len(quality_response.split('\n')) - 8} 行)")
 
                 # 🔧 新增：卫星智能体详细响应日志
                 elif event.author and any(sat_name in event.author for sat_name in ['Satellite', 'GDOP_Sat', 'TestSat']):
-                    if event.content and event.content.parts:
-                        satellite_response = ""
-                        for part in event.content.parts:
-                            if hasattr(part, 'text') and part.text:
-                                satellite_response += part.text
-
-                        if satellite_response and len(satellite_response) > 50:  # 降低阈值，显示更多响应
-                            logger.info(f"🛰️ 卫星智能体 {event.author} LLM响应分析:")
-
-                            # 提取关键信息
-                            lines = satellite_response.split('\n')
-                            for line in lines:
-                                line = line.strip()
-                                if any(keyword in line.lower() for keyword in ['gdop', '几何精度', '定位精度']):
-                                    logger.info(f"   🎯 GDOP相关: {line}")
-                                elif any(keyword in line.lower() for keyword in ['任务', 'task', '执行', '状态']):
-                                    logger.info(f"   📋 任务状态: {line}")
-                                elif any(keyword in line.lower() for keyword in ['资源', 'resource', '功率', '燃料']):
-                                    logger.info(f"   ⚡ 资源状态: {line}")
-                                elif any(keyword in line.lower() for keyword in ['覆盖', 'coverage', '可见', '观测']):
-                                    logger.info(f"   📡 覆盖分析: {line}")
-                                elif any(keyword in line.lower() for keyword in ['轨道', 'orbit', '位置', 'position']):
-                                    logger.info(f"   🌍 轨道信息: {line}")
-                                elif any(keyword in line.lower() for keyword in ['分析', 'analysis', '评估', '计算']):
-                                    logger.info(f"   📊 分析结果: {line}")
-
-                            # 显示完整响应摘要
-                            logger.info(f"📋 卫星智能体 {event.author} 完整响应摘要:")
-                            response_lines = satellite_response.split('\n')[:6]
-                            for i, line in enumerate(response_lines):
-                                if line.strip():
-                                    logger.info(f"   {i+1}. {line.strip()}")
-
-                            if len(response_lines) > 6:
-                                logger.info(f"   ... (还有 {len(satellite_response.split('\n')) - 6} 行，共 {len(satellite_response)} 字符)")
+                    satellite_response = text
+                    if satellite_response and len(satellite_response) > 50:  # 降低阈值，显示更多响应
+                        logger.info(f"🛰️ 卫星智能体 {event.author} LLM响应分析:")
+
+                        # 提取关键信息
+                        lines = satellite_response.split('\n')
+                        for line in lines:
+                            line = line.strip()
+                            if any(keyword in line.lower() for keyword in ['gdop', '几何精度', '定位精度']):
+                                logger.info(f"   🎯 GDOP相关: {line}")
+                            elif any(keyword in line.lower() for keyword in ['任务', 'task', '执行', '状态']):
+                                logger.info(f"   📋 任务状态: {line}")
+                            elif any(keyword in line.lower() for keyword in ['资源', 'resource', '功率', '燃料']):
+                                logger.info(f"   ⚡ 资源状态: {line}")
+                            elif any(keyword in line.lower() for keyword in ['覆盖', 'coverage', '可见', '观测']):
+                                logger.info(f"   📡 覆盖分析: {line}")
+                            elif any(keyword in line.lower() for keyword in ['轨道', 'orbit', '位置', 'position']):
+                                logger.info(f"   🌍 轨道信息: {line}")
+                            elif any(keyword in line.lower() for keyword in ['分析', 'analysis', '评估', '计算']):
+                                logger.info(f"   📊 分析结果: {line}")
+
+                        # 显示完整响应摘要
+                        logger.info(f"📋 卫星智能体 {event.author} 完整响应摘要:")
+                        response_lines = satellite_response.split('\n')[:6]
+                        for i, line in enumerate(response_lines):
+                            if line.strip():
+                                logger.info(f"   {i+1}. {line.strip()}")
+
+                        if len(response_lines) > 6:
+                            logger.info(f"   ... (还有 {len(satellite_response.split('\n')) - 6} 行，共 {len(satellite_response)} 字符)")
 
                 # 🔧 新增：聚合器智能体详细响应日志
                 elif event.author and any(agent_name in event.author for agent_name in ['GatherAgent', 'Gather', 'Aggregator']):
-                    if event.content and event.content.parts:
-                        gather_response = ""
-                        for part in event.content.parts:
-                            if hasattr(part, 'text') and part.text:
-                                gather_response += part.text
-
-                        if gather_response:
-                            logger.info(f"🔄 聚合器智能体 {event.author} LLM响应分析:")
-
-                            # 提取关键聚合信息
-                            lines = gather_response.split('\n')
-                            for line in lines:
-                                line = line.strip()
-                                if any(keyword in line.lower() for keyword in ['综合', '聚合', '整合', '汇总']):
-                                    logger.info(f"   🔄 聚合分析: {line}")
-                                elif any(keyword in line.lower() for keyword in ['gdop', '几何精度']):
-                                    logger.info(f"   🎯 GDOP聚合: {line}")
-                                elif any(keyword in line.lower() for keyword in ['建议', 'recommend', '优化', '改进']):
-                                    logger.info(f"   💡 优化建议: {line}")
-                                elif any(keyword in line.lower() for keyword in ['结论', 'conclusion', '总结', '评估']):
-                                    logger.info(f"   📊 评估结论: {line}")
-
-                            # 显示聚合器完整响应摘要
-                            logger.info(f"📋 聚合器 {event.author} 完整响应摘要:")
-                            response_lines = gather_response.split('\n')[:8]
-                            for i, line in enumerate(response_lines):
-                                if line.strip():
-                                    logger.info(f"   {i+1}. {line.strip()}")
-
-                            if len(response_lines) > 8:
-                                logger.info(f"   ... (还有 {len(gather_response.split('\n')) - 8} 行，共 {len(gather_response)} 字符)")
+                    gather_response = text
+                    if gather_response:
+                        logger.info(f"🔄 聚合器智能体 {event.author} LLM响应分析:")
+
+                        # 提取关键聚合信息
+                        lines = gather_response.split('\n')
+                        for line in lines:
+                            line = line.strip()
+                            if any(keyword in line.lower() for keyword in ['综合', '聚合', '整合', '汇总']):
+                                logger.info(f"   🔄 聚合分析: {line}")
+                            elif any(keyword in line.lower() for keyword in ['gdop', '几何精度']):
+                                logger.info(f"   🎯 GDOP聚合: {line}")
+                            elif any(keyword in line.lower() for keyword in ['建议', 'recommend', '优化', '改进']):
+                                logger.info(f"   💡 优化建议: {line}")
+                            elif any(keyword in line.lower() for keyword in ['结论', 'conclusion', '总结', '评估']):
+                                logger.info(f"   📊 评估结论: {line}")
+
+                        # 显示聚合器完整响应摘要
+                        logger.info(f"📋 聚合器 {event.author} 完整响应摘要:")
+                        response_lines = gather_response.split('\n')[:8]
+                        for i, line in enumerate(response_lines):
+                            if line.strip():
+                                logger.info(f"   {i+1}. {line.strip()}")
+
+                        if len(response_lines) > 8:
+                            logger.info(f"   ... (还有 {len(gather_response.split('\n')) - 8} 行，共 {len(gather_response)} 字符)")
 
                 # 🔧 新增：其他智能体详细响应日志
-                elif event.author and event.content and event.content.parts:
+                elif event.author and text:
                     # 处理其他类型的智能体响应
-                    other_response = ""
-                    for part in event.content.parts:
-                        if hasattr(part, 'text') and part.text:
-                            other_response += part.text
-
+                    other_response = text
                     if other_response and len(other_response) > 100:
                         logger.info(f"🤖 智能体 {event.author} LLM响应分析:")
 
@@ -479,12 +700,7 @@ class ADKOfficialDiscussionSystem(LlmAgent):
                             logger.info(f"   ... (共 {len(other_response)} 字符)")
 
             # 合并所有响应
-            response = ""
-            for event in response_events:
-                if event.content and hasattr(event.content, 'parts'):
-                    for part in event.content.parts:
-                        if hasattr(part, 'text') and part.text:
-                            response += part.text
+            response = "".join(response_texts)
 
             # 🔧 新增：LLM响应统计分析
             logger.info(f"🧠 LLM推理完成，响应长度: {len(str(response))} 字符")
@@ -493,30 +709,24 @@ class ADKOfficialDiscussionSystem(LlmAgent):
             agent_responses = {}
             total_response_length = 0
 
-            for event in response_events:
-                if event.author and event.content and event.content.parts:
-                    event_response = ""
-                    for part in event.content.parts:
-                        if hasattr(part, 'text') and part.text:
-                            event_response += part.text
-
-                    if event_response:
-                        agent_type = "其他智能体"
-                        if "QualityChecker" in event.author:
-                            agent_type = "质量检查器"
-                        elif any(sat_name in event.author for sat_name in ['Satellite', 'GDOP_Sat', 'TestSat']):
-                            agent_type = "卫星智能体"
-                        elif any(agent_name in event.author for agent_name in ['GatherAgent', 'Gather', 'Aggregator']):
-                            agent_type = "聚合器智能体"
-
-                        if agent_type not in agent_responses:
-                            agent_responses[agent_type] = []
-                        agent_responses[agent_type].append({
-                            'author': event.author,
-                            'length': len(event_response),
-                            'content': event_response[:100] + "..." if len(event_response) > 100 else event_response
-                        })
-                        total_response_length += len(event_response)
+            for event, event_response in zip(response_events, response_texts):
+                if event.author and event_response:
+                    agent_type = "其他智能体"
+                    if "QualityChecker" in event.author:
+                        agent_type = "质量检查器"
+                    elif any(sat_name in event.author for sat_name in ['Satellite', 'GDOP_Sat', 'TestSat']):
+                        agent_type = "卫星智能体"
+                    elif any(agent_name in event.author for agent_name in ['GatherAgent', 'Gather', 'Aggregator']):
+                        agent_type = "聚合器智能体"
+
+                    if agent_type not in agent_responses:
+                        agent_responses[agent_type] = []
+                    agent_responses[agent_type].append({
+                        'author': event.author,
+                        'length': len(event_response),
+                        'content': event_response[:100] + "..." if len(event_response) > 100 else event_response
+                    })
+                    total_response_length += len(event_response)
 
             # 显示响应统计
             logger.info(f"📊 LLM响应统计分析:")
@@ -533,7 +743,10 @@ class ADKOfficialDiscussionSystem(LlmAgent):
             logger.info(f"📊 LLM响应摘要: {str(response)[:200]}...")
 
             # 🔧 新增：迭代进度统计
-            quality_checker_events = [e for e in response_events if e.author and "QualityChecker" in e.author]
+            quality_checker_events = [
+                (e, t) for e, t in zip(response_events, response_texts)
+                if e.author and "QualityChecker" in e.author
+            ]
             if quality_checker_events:
                 current_iteration = len(quality_checker_events)
                 logger.info(f"🔄 迭代进度统计:")
@@ -548,13 +761,8 @@ class ADKOfficialDiscussionSystem(LlmAgent):
                     logger.info(f"   迭代状态: 首次质量检查完成")
 
                 # 检查是否应该停止迭代
-                last_quality_event = quality_checker_events[-1]
-                if last_quality_event.content and last_quality_event.content.parts:
-                    last_response = ""
-                    for part in last_quality_event.content.parts:
-                        if hasattr(part, 'text') and part.text:
-                            last_response += part.text
-
+                _, last_response = quality_checker_events[-1]
+                if last_response:
                     if "停止迭代" in last_response or "不继续" in last_response or "escalate" in last_response.lower():
                         logger.info(f"   🛑 质量检查器建议停止迭代")
                     elif "继续迭代" in last_response or "需要优化" in last_response:
@@ -578,7 +786,6 @@ class ADKOfficialDiscussionSystem(LlmAgent):
 
         except Exception as e:
             logger.error(f"❌ 执行讨论组失败: {discussion_id}, 错误: {e}")
-            import traceback
             traceback.print_exc()
 
             # 保存错误信息
@@ -594,33 +801,28 @@ class ADKOfficialDiscussionSystem(LlmAgent):
 
             # 不抛出异常，让讨论组创建成功，但标记为执行失败
 
-    async def _cleanup_agents_old_relationships(self, agents: List[BaseAgent]):
-        """检查并清理智能体的旧关系"""
-        logger.info(f"🧹 检查并清理 {len(agents)} 个智能体的旧关系")
-        
-        for agent in agents:
-            # 检查是否有旧的父子关系
-            if hasattr(agent, '_parent_agent'):
-                delattr(agent, '_parent_agent')
-            if hasattr(agent, '_sub_agents'):
-                delattr(agent, '_sub_agents')
-            if hasattr(agent, '_discussion_id'):
-                delattr(agent, '_discussion_id')
-        
-        logger.info("✅ 所有智能体都没有旧的父子关系")
+    def _reset_agents_for_new_discussion(self, agent_dicts: List[Dict[str, Any]]):
+        """
+        清理智能体的旧关系并强制重置智能体状态（单次遍历）
+
+        Args:
+            agent_dicts: 参与智能体的实例属性字典列表
+        """
+        logger.info(f"🧹 检查并清理 {len(agent_dicts)} 个智能体的旧关系并重置状态")
+
+        for agent_dict in agent_dicts:
+            # 清理旧的父子关系
+            agent_dict.pop('_parent_agent', None)
+            agent_dict.pop('_sub_agents', None)
+            agent_dict.pop('_discussion_id', None)
 
-    async def _force_reset_agents(self, agents: List[BaseAgent]):
-        """强制重置智能体状态"""
-        logger.info(f"🔧 强制重置 {len(agents)} 个智能体状态")
-        
-        for agent in agents:
             # 重置智能体的内部状态
-            if hasattr(agent, '_last_response'):
-                agent._last_response = None
-            if hasattr(agent, '_execution_count'):
-                agent._execution_count = 0
-        
-        logger.info("✅ 所有智能体状态重置完成")
+            if '_last_response' in agent_dict:
+                agent_dict['_last_response'] = None
+            if '_execution_count' in agent_dict:
+                agent_dict['_execution_count'] = 0
+
+        logger.info("✅ 所有智能体旧关系已清理，状态重置完成")
 
     async def complete_discussion(self, discussion_id: str) -> Dict[str, Any]:
         """
@@ -746,72 +948,74 @@ class ADKOfficialDiscussionSystem(LlmAgent):
 
             logger.info(f"🔄 开始安全解散 {len(participating_agents)} 个智能体")
 
-            for agent in participating_agents:
-                # 只处理具身卫星智能体
-                if hasattr(agent, 'satellite_id'):
-                    satellite_id = agent.satellite_id
-
-                    try:
-                        # 🎯 ADK标准：只清理父智能体关系，保持具身智能体状态
-                        self._safely_remove_parent_relationship(agent, satellite_id)
-
-                        # 🔧 保持重要状态：任务执行状态、资源状态等
-                        self._preserve_embodied_agent_state(agent, satellite_id)
-
-                        logger.info(f"✅ 卫星智能体 {satellite_id} 已安全解散（状态已保持）")
+            # 只处理具身卫星智能体，各智能体的解散互不依赖，并发执行
+            satellite_agents = [agent for agent in participating_agents if hasattr(agent, 'satellite_id')]
+            results = await asyncio.gather(
+                *(self._dissolve_single_agent(agent) for agent in satellite_agents),
+                return_exceptions=True
+            )
 
-                    except Exception as agent_error:
-                        logger.warning(f"⚠️ 解散卫星智能体 {satellite_id} 时出现问题: {agent_error}")
-                        # 继续处理其他智能体，不中断整个过程
+            dissolved_count = 0
+            preserved_total = 0
+            for agent, result in zip(satellite_agents, results):
+                if isinstance(result, Exception):
+                    # 继续处理其他智能体，不中断整个过程
+                    logger.warning("⚠️ 解散卫星智能体 %s 时出现问题: %s", agent.satellite_id, result)
+                else:
+                    dissolved_count += 1
+                    preserved_total += result
 
-            logger.info(f"✅ 所有智能体已安全解散，具身状态已保持")
+            logger.info("✅ 已安全解散 %d 个卫星智能体，具身状态已保持（共 %d 个重要状态）",
+                        dissolved_count, preserved_total)
 
         except Exception as e:
             logger.error(f"❌ 安全解散智能体失败: {e}")
             # 不抛出异常，确保讨论组清理可以继续
 
-    def _safely_remove_parent_relationship(self, agent, satellite_id: str):
+    async def _dissolve_single_agent(self, agent) -> int:
+        """安全解散单个具身卫星智能体，返回保留的重要状态数量"""
+        agent_logger = _SatelliteLogAdapter(logger, {'satellite_id': agent.satellite_id})
+
+        # 🎯 ADK标准：只清理父智能体关系，保持具身智能体状态
+        self._safely_remove_parent_relationship(agent, agent_logger)
+
+        # 🔧 保持重要状态：任务执行状态、资源状态等
+        preserved_count = self._preserve_embodied_agent_state(agent, agent_logger)
+
+        agent_logger.debug("✅ 卫星智能体已安全解散（状态已保持）")
+        return preserved_count
+
+    def _safely_remove_parent_relationship(self, agent, agent_logger: logging.LoggerAdapter):
         """
         安全移除智能体的父关系（ADK标准方式）
 
         只清理ADK框架的父子关系，不影响具身智能体本身
         """
         try:
-            # 🎯 ADK标准：清理所有可能的父智能体属性
-            parent_attributes = [
-                '_parent_agent',    # ADK标准父智能体属性
-                'parent_agent',     # 可能的别名
-                '_adk_parent',      # ADK内部父引用
-                '_parent',          # 通用父引用
-            ]
+            agent_dict = agent.__dict__
+            debug_enabled = agent_logger.isEnabledFor(logging.DEBUG)
 
-            for attr in parent_attributes:
-                if hasattr(agent, attr):
-                    old_parent = getattr(agent, attr)
-                    if old_parent is not None:
-                        logger.debug(f"   清理 {satellite_id} 的 {attr}: {getattr(old_parent, 'name', 'unknown')}")
-                        setattr(agent, attr, None)
+            # 🎯 ADK标准：清理所有可能的父智能体属性
+            for attr in _PARENT_ATTRS:
+                old_parent = agent_dict.get(attr)
+                if old_parent is not None:
+                    if debug_enabled:
+                        agent_logger.debug("   清理 %s: %s", attr, getattr(old_parent, 'name', 'unknown'))
+                    agent_dict[attr] = None
 
             # 🔧 清理ADK内部状态（如果存在）
-            adk_internal_attributes = [
-                '_sub_agents',      # 子智能体列表
-                '_discussion_id',   # 讨论组ID
-                '_adk_context',     # ADK上下文
-                '_adk_session',     # ADK会话
-            ]
-
-            for attr in adk_internal_attributes:
-                if hasattr(agent, attr):
-                    setattr(agent, attr, None)
-                    logger.debug(f"   清理 {satellite_id} 的 {attr}")
+            for attr in _ADK_INTERNAL_ATTRS:
+                if attr in agent_dict:
+                    agent_dict[attr] = None
+                    agent_logger.debug("   清理 %s", attr)
 
-            logger.debug(f"✅ {satellite_id} 的父关系已安全清理")
+            agent_logger.debug("✅ 父关系已安全清理")
 
         except Exception as e:
-            logger.warning(f"⚠️ 清理 {satellite_id} 父关系失败: {e}")
+            agent_logger.warning("⚠️ 清理父关系失败: %s", e)
             # 不抛出异常，继续处理
 
-    def _preserve_embodied_agent_state(self, agent, satellite_id: str):
+    def _preserve_embodied_agent_state(self, agent, agent_logger: logging.LoggerAdapter) -> int:
         """
         保持具身智能体的重要状态
 
@@ -823,48 +1027,27 @@ class ADKOfficialDiscussionSystem(LlmAgent):
         """
         try:
             # 🎯 保持的重要状态（这些状态对下次滚动规划很重要）
-            preserved_states = [
-                'satellite_id',           # 卫星ID（核心标识）
-                '_config',               # 配置信息
-                '_time_manager',         # 时间管理器
-                '_stk_manager',          # STK管理器
-                '_multi_agent_system',   # 多智能体系统引用
-                'memory_module',         # 记忆模块
-                '_task_history',         # 任务历史
-                '_resource_status',      # 资源状态
-                '_performance_metrics',  # 性能指标
-                '_collaboration_history', # 协作历史
-                '_visibility_calculator', # 可见性计算器
-                '_discussion_groups',    # 讨论组历史
-            ]
-
             preserved_count = 0
-            for state_attr in preserved_states:
-                if hasattr(agent, state_attr):
-                    # 确保这些状态不被意外清理
-                    value = getattr(agent, state_attr)
-                    if value is not None:
-                        preserved_count += 1
-                        logger.debug(f"   保持 {satellite_id}.{state_attr}")
+            for state_attr in _PRESERVED_STATE_ATTRS:
+                # 确保这些状态不被意外清理
+                if getattr(agent, state_attr, None) is not None:
+                    preserved_count += 1
+                    agent_logger.debug("   保持 %s", state_attr)
 
             # 🔧 重置临时执行状态（但保持重要状态）
-            temporary_states = {
-                '_last_response': None,      # 清理上次响应
-                '_current_iteration': 0,     # 重置迭代计数
-                '_iteration_results': [],    # 清理迭代结果
-                '_discussion_state': None,   # 清理讨论状态
-            }
-
-            for attr, default_value in temporary_states.items():
-                if hasattr(agent, attr):
-                    setattr(agent, attr, default_value)
-                    logger.debug(f"   重置 {satellite_id}.{attr}")
+            agent_dict = agent.__dict__
+            for attr, default_factory in _TEMPORARY_STATE_RESETS:
+                if attr in agent_dict:
+                    agent_dict[attr] = default_factory()
+                    agent_logger.debug("   重置 %s", attr)
 
-            logger.debug(f"✅ {satellite_id} 状态已保持：{preserved_count} 个重要状态保留")
+            agent_logger.debug("✅ 状态已保持：%d 个重要状态保留", preserved_count)
+            return preserved_count
 
         except Exception as e:
-            logger.warning(f"⚠️ 保持 {satellite_id} 状态失败: {e}")
+            agent_logger.warning("⚠️ 保持状态失败: %s", e)
             # 不抛出异常，继续处理
+            return 0
 
     def _create_adk_parallel_fanout_pattern(
         self,
@@ -880,60 +1063,36 @@ class ADKOfficialDiscussionSystem(LlmAgent):
         2. LlmAgent聚合器收集和分析结果
         3. SequentialAgent组合Fan-Out和Gather阶段
         """
-        from google.adk.agents import ParallelAgent, SequentialAgent, LlmAgent
-
         logger.info(f"🔄 创建ADK官方Parallel Fan-Out/Gather模式: {discussion_id}")
 
-        # 阶段1：Parallel Fan-Out - 所有智能体并发执行
-        parallel_stage = ParallelAgent(
-            name=f"ParallelFanOut_{discussion_id}",
-            sub_agents=participating_agents
-        )
+        # 阶段1：Parallel Fan-Out - 所有智能体并发执行（单个智能体无需并发包装，
+        # 智能体较多时分组执行并局部聚合，减轻最终聚合器的负担）
+        gather_instruction = _GATHER_INSTRUCTION_TMPL.format(task_description=task_description)
+        if len(participating_agents) == 1:
+            parallel_stage = participating_agents[0]
+        elif len(participating_agents) > _FANOUT_BUCKET_THRESHOLD:
+            bucket_count = math.ceil(math.sqrt(len(participating_agents)))
+            parallel_stage = self._create_bucketed_fanout_stage(
+                discussion_id, participating_agents, task_description, bucket_count
+            )
+            # 最终聚合器通过ADK状态注入读取各分组的局部汇总结果
+            gather_instruction += _FINAL_GATHER_PARTIALS_TMPL.format(
+                bucket_count=bucket_count,
+                partials="\n".join(
+                    f"分组{i}: {{partial_gather_result_{i}}}" for i in range(bucket_count)
+                )
+            )
+        else:
+            parallel_stage = ParallelAgent(
+                name=f"ParallelFanOut_{discussion_id}",
+                sub_agents=participating_agents
+            )
 
         # 阶段2：Gather - 专业聚合器（继承父类的模型配置）
         gather_agent = LlmAgent(
             name=f"GatherAgent_{discussion_id}",
             model=self.model,  # 继承ADKOfficialDiscussionSystem的模型配置
-            instruction=f"""
-你是专业的结果聚合器，负责收集和深度分析并发执行的结果。
-
-任务描述: {task_description}
-
-请执行以下专业分析步骤：
-
-1. **结果收集与整理**：
-   - 收集所有卫星智能体的执行结果
-   - 整理各智能体的分析数据和指标
-
-2. **专业指标计算**：
-   - 计算系统级GDOP（几何精度因子，越小越好，理想值<2.0）
-   - 评估整体鲁棒性评分
-   - 分析覆盖率和任务可行性
-   - 计算资源利用效率
-
-3. **深度分析报告**：
-   - 分析结果的一致性和质量
-   - 识别潜在的系统瓶颈
-   - 评估任务执行风险
-   - 提供优化建议
-
-4. **结构化输出**：
-   请以以下格式输出分析结果：
-
-   ## 系统级指标
-   - 整体GDOP: [数值，越小越好，理想值<2.0]
-   - 系统鲁棒性: [0-100评分]
-   - 覆盖率: [百分比]
-   - 资源利用率: [百分比]
-
-   ## 详细分析
-   [具体分析内容]
-
-   ## 优化建议
-   [改进建议]
-
-将聚合结果保存到session.state['fanout_gather_result']中。
-""",
+            instruction=gather_instruction,
             output_key="fanout_gather_result"
         )
 
@@ -957,6 +1116,60 @@ class ADKOfficialDiscussionSystem(LlmAgent):
 
         return discussion_agent
 
+    def _create_bucketed_fanout_stage(
+        self,
+        discussion_id: str,
+        participating_agents: List[BaseAgent],
+        task_description: str,
+        bucket_count: int
+    ) -> ParallelAgent:
+        """
+        创建分组的Fan-Out阶段
+
+        将智能体均分为bucket_count个分组，每组内ParallelAgent并发执行后由局部聚合器汇总到
+        session.state['partial_gather_result_{i}']，各分组之间同样并发执行；
+        最终聚合器的指令通过状态注入读取这些局部汇总结果。
+        """
+        agent_count = len(participating_agents)
+        base_size, remainder = divmod(agent_count, bucket_count)
+
+        bucket_pipelines = []
+        start = 0
+        for bucket_index in range(bucket_count):
+            # 前remainder个分组各多分配一个智能体，保证恰好bucket_count个非空分组
+            end = start + base_size + (1 if bucket_index < remainder else 0)
+            bucket_agents = participating_agents[start:end]
+            start = end
+            output_key = f"partial_gather_result_{bucket_index}"
+
+            partial_gather = LlmAgent(
+                name=f"PartialGather_{discussion_id}_{bucket_index}",
+                model=self.model,  # 继承ADKOfficialDiscussionSystem的模型配置
+                instruction=_PARTIAL_GATHER_INSTRUCTION_TMPL.format(
+                    agent_count=len(bucket_agents),
+                    task_description=task_description,
+                    output_key=output_key
+                ),
+                output_key=output_key
+            )
+            bucket_pipelines.append(SequentialAgent(
+                name=f"FanOutBucket_{discussion_id}_{bucket_index}",
+                sub_agents=[
+                    ParallelAgent(
+                        name=f"ParallelFanOut_{discussion_id}_{bucket_index}",
+                        sub_agents=bucket_agents
+                    ),
+                    partial_gather
+                ]
+            ))
+
+        logger.info(f"   Fan-Out分组执行: {agent_count} 个智能体分为 {len(bucket_pipelines)} 组")
+
+        return ParallelAgent(
+            name=f"ParallelFanOut_{discussion_id}",
+            sub_agents=bucket_pipelines
+        )
+
     def _create_adk_sequential_pipeline_pattern(
         self,
         discussion_id: str,
@@ -971,8 +1184,6 @@ class ADKOfficialDiscussionSystem(LlmAgent):
         2. 通过session.state传递流水线结果
         3. 每个智能体读取前一个的输出
         """
-        from google.adk.agents import SequentialAgent
-
         logger.info(f"🔄 创建ADK官方Sequential Pipeline模式: {discussion_id}")
 
         # 为每个智能体设置流水线配置
@@ -1012,69 +1223,22 @@ class ADKOfficialDiscussionSystem(LlmAgent):
         2. 通过session.state保持迭代状态
         3. 通过escalate=True终止循环
         """
-        from google.adk.agents import LoopAgent, SequentialAgent, LlmAgent, BaseAgent
-        from google.adk.events import Event, EventActions
-        from google.adk.agents.invocation_context import InvocationContext
-        from typing import AsyncGenerator
-
         logger.info(f"🔄 创建ADK官方Iterative Refinement模式: {discussion_id}")
 
-        # 创建并发执行阶段
-        parallel_stage = ParallelAgent(
-            name=f"IterativeParallel_{discussion_id}",
-            sub_agents=participating_agents
-        )
+        # 创建并发执行阶段（单个智能体无需并发包装）
+        if len(participating_agents) == 1:
+            parallel_stage = participating_agents[0]
+        else:
+            parallel_stage = ParallelAgent(
+                name=f"IterativeParallel_{discussion_id}",
+                sub_agents=participating_agents
+            )
 
         # 创建专业质量检查和优化智能体（继承父类的模型配置）
         quality_checker = LlmAgent(
             name=f"QualityChecker_{discussion_id}",
             model=self.model,  # 继承ADKOfficialDiscussionSystem的模型配置
-            instruction=f"""
-你是专业的质量检查和优化智能体，负责深度评估迭代结果并决定是否继续优化。
-
-任务描述: {task_description}
-
-请执行以下专业评估步骤：
-
-1. **多维度质量评估**：
-   - GDOP质量评分（0-1）
-   - 鲁棒性评分（0-1）
-   - 覆盖率评分（0-1）
-   - 资源效率评分（0-1）
-
-2. **综合质量计算**：
-   - 计算加权综合质量分数
-   - 权重：GDOP(0.3) + 鲁棒性(0.3) + 覆盖率(0.2) + 效率(0.2)
-
-3. **迭代决策逻辑**：
-   - 如果综合质量分数 >= 0.85，设置escalate=True停止迭代
-   - 如果分数 < 0.6，提供具体改进建议
-   - 如果0.6 <= 分数 < 0.85，进行微调优化
-
-4. **专业改进建议**：
-   - 基于具体指标提供优化方向
-   - 识别性能瓶颈和改进点
-   - 提供量化的改进目标
-
-请以结构化格式输出评估结果：
-
-## 质量评估结果
-- GDOP评分: [0-1]
-- 鲁棒性评分: [0-1]
-- 覆盖率评分: [0-1]
-- 效率评分: [0-1]
-- **综合质量分数: [0-1]**
-
-## 迭代决策
-- 是否继续迭代: [是/否]
-- 决策理由: [具体原因]
-
-## 改进建议
-[具体的优化建议]
-
-将结果保存到session.state['iterative_result']中。
-如果需要停止迭代，设置session.state['should_escalate'] = True。
-""",
+            instruction=_QUALITY_CHECKER_INSTRUCTION_TMPL.format(task_description=task_description),
             output_key="iterative_result"
         )
 
@@ -1102,9 +1266,3 @@ class ADKOfficialDiscussionSystem(LlmAgent):
         logger.info(f"   最大迭代次数: 5")
 
         return discussion_agent
-
-    def __del__(self):
-        """析构函数，确保清理资源"""
-        if self._lifecycle_monitor_task and not self._lifecycle_monitor_task.done():
-            self._lifecycle_monitor_task.cancel()
-            logger.info("🛑 生命周期监控已停止")
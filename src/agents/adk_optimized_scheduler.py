@@ -5,6 +5,7 @@ ADK优化的仿真调度智能体
 
 import asyncio
 import logging
+import time
 from datetime import datetime
 from typing import Dict, List, Any, Optional, AsyncGenerator
 from uuid import uuid4
@@ -19,6 +20,28 @@ from google.adk.tools import FunctionTool
 
 logger = logging.getLogger(__name__)
 
+# 已由ADK优化版本替代的传统工具名称
+_OPTIMIZED_TOOL_NAMES = frozenset({'initialize_complete_system'})
+
+# 活跃导弹查询结果的缓存有效期（秒）
+_MISSILE_CACHE_TTL = 0.5
+
+# 常用固定状态消息的预构建内容，避免每次产生事件时重复构造Content/Part
+_STATIC_CONTENT = {
+    text: types.Content(parts=[types.Part(text=text)])
+    for text in (
+        "🔄 自动初始化ADK transfer模式...",
+        "✅ ADK transfer模式初始化成功",
+        "⚠️ ADK transfer模式初始化失败，使用传统模式",
+        "🚀 启动ADK优化的滚动规划周期",
+        "⚠️ ADK transfer初始化失败，回退到传统模式",
+        "🎉 ADK优化规划周期完成",
+        "🎯 生成元任务集...",
+        "⏳ 等待ADK transfer任务完成...",
+        "🎯 无活跃目标，规划周期结束",
+    )
+}
+
 
 class ADKOptimizedScheduler(ADKTransferIntegratedScheduler):
     """
@@ -42,65 +65,71 @@ class ADKOptimizedScheduler(ADKTransferIntegratedScheduler):
         # 默认启用transfer模式
         object.__setattr__(self, '_transfer_enabled', True)
         object.__setattr__(self, '_auto_initialize_transfer', True)
-
-        # 重写工具集，集成传统调度器的所有工具
+        # 已完成结构初始化的session.state，避免每次运行重复检查
+        object.__setattr__(self, '_initialized_session_state', None)
+        # 活跃导弹查询缓存：查询名 -> (monotonic时间戳, 结果)
+        object.__setattr__(self, '_missile_cache', {})
+
+        # 任务委托并发上限，避免大量导弹同时委托压垮LLM/transfer调用
+        scheduler_config = self._config_manager.config.get('multi_agent_system', {}).get('simulation_scheduler', {})
+        object.__setattr__(self, '_max_concurrent_delegations',
+                           scheduler_config.get('max_concurrent_delegations', 16))
+        # 信号量只能在创建它的事件循环中使用，按事件循环惰性创建
+        object.__setattr__(self, '_delegate_semaphore', None)
+        object.__setattr__(self, '_delegate_semaphore_loop', None)
+
+        # 重写工具集，集成传统调度器的所有工具（复用父类初始化时已创建的工具）
+        object.__setattr__(self, '_parent_tools', list(self.tools))
         self.tools = self._create_optimized_tools()
 
         logger.info("🚀 ADK优化调度器初始化完成（默认启用transfer模式）")
 
+    def _ev(self, text: str, actions: Optional[EventActions] = None) -> Event:
+        """构建本调度器的状态事件，固定消息复用预构建的内容"""
+        content = _STATIC_CONTENT.get(text) or types.Content(parts=[types.Part(text=text)])
+        if actions is None:
+            return Event(author=self.name, content=content)
+        return Event(author=self.name, content=content, actions=actions)
+
     async def _run_async_impl(self, ctx: InvocationContext) -> AsyncGenerator[Event, None]:
         """
         重写运行方法，自动初始化ADK transfer模式
         """
         try:
             # 检查是否需要初始化ADK transfer模式
-            needs_init = getattr(self, '_needs_transfer_init', False) or (self._auto_initialize_transfer and not self._transfer_enabled)
+            needs_init = self._needs_transfer_init or (self._auto_initialize_transfer and not self._transfer_enabled)
 
             if needs_init:
-                yield Event(
-                    author=self.name,
-                    content=types.Content(parts=[types.Part(text="🔄 自动初始化ADK transfer模式...")])
-                )
+                yield self._ev("🔄 自动初始化ADK transfer模式...")
 
                 success = await self.initialize_adk_transfer_mode()
                 if success:
-                    yield Event(
-                        author=self.name,
-                        content=types.Content(parts=[types.Part(text="✅ ADK transfer模式初始化成功")])
-                    )
+                    yield self._ev("✅ ADK transfer模式初始化成功")
                     # 清除初始化标记
                     object.__setattr__(self, '_needs_transfer_init', False)
                 else:
-                    yield Event(
-                        author=self.name,
-                        content=types.Content(parts=[types.Part(text="⚠️ ADK transfer模式初始化失败，使用传统模式")])
-                    )
+                    yield self._ev("⚠️ ADK transfer模式初始化失败，使用传统模式")
             
-            # 设置session.state引用
-            if ctx and hasattr(ctx, 'session') and hasattr(ctx.session, 'state'):
-                self.set_session_state(ctx.session.state)
-                
+            # 设置session.state引用（同一session只初始化一次）
+            status_lines = []
+            session_state = getattr(getattr(ctx, 'session', None), 'state', None)
+            if session_state is not None and session_state is not self._initialized_session_state:
+                self.set_session_state(session_state)
+
                 # 初始化session.state结构
-                if 'task_results' not in ctx.session.state:
-                    ctx.session.state['task_results'] = {}
-                if 'planning_trigger' not in ctx.session.state:
-                    ctx.session.state['planning_trigger'] = False
-                if 'pending_delegations' not in ctx.session.state:
-                    ctx.session.state['pending_delegations'] = {}
-                
-                yield Event(
-                    author=self.name,
-                    content=types.Content(parts=[types.Part(text="✅ ADK transfer session.state已初始化")])
-                )
-            
-            # 显示当前模式
+                session_state.setdefault('task_results', {})
+                session_state.setdefault('planning_trigger', False)
+                session_state.setdefault('pending_delegations', {})
+
+                object.__setattr__(self, '_initialized_session_state', session_state)
+                status_lines.append("✅ ADK transfer session.state已初始化")
+
+            # 显示当前模式（与session初始化状态合并为一个事件）
             mode = "ADK Transfer模式" if self._transfer_enabled else "传统模式"
-            satellite_count = len(getattr(self, 'sub_agents', []))
-            
-            yield Event(
-                author=self.name,
-                content=types.Content(parts=[types.Part(text=f"🎯 运行模式: {mode}，管理 {satellite_count} 个卫星智能体")])
-            )
+            satellite_count = len(self.sub_agents)
+            status_lines.append(f"🎯 运行模式: {mode}，管理 {satellite_count} 个卫星智能体")
+
+            yield self._ev("\n".join(status_lines))
             
             # 调用父类的运行逻辑
             async for event in super()._run_async_impl(ctx):
@@ -108,113 +137,185 @@ class ADKOptimizedScheduler(ADKTransferIntegratedScheduler):
                 
         except Exception as e:
             logger.error(f"❌ ADK优化调度器运行失败: {e}")
-            yield Event(
-                author=self.name,
-                content=types.Content(parts=[types.Part(text=f"❌ 运行失败: {e}")]),
-                actions=EventActions(escalate=True)
-            )
+            yield self._ev(f"❌ 运行失败: {e}", actions=EventActions(escalate=True))
 
     async def start_optimized_planning_cycle(self, ctx: InvocationContext) -> AsyncGenerator[Event, None]:
         """
         启动优化的规划周期，使用ADK transfer机制
         """
         try:
-            yield Event(
-                author=self.name,
-                content=types.Content(parts=[types.Part(text="🚀 启动ADK优化的滚动规划周期")])
-            )
+            yield self._ev("🚀 启动ADK优化的滚动规划周期")
             
             if not self._transfer_enabled:
                 # 如果transfer未启用，尝试初始化
                 success = await self.initialize_adk_transfer_mode()
                 if not success:
-                    yield Event(
-                        author=self.name,
-                        content=types.Content(parts=[types.Part(text="⚠️ ADK transfer初始化失败，回退到传统模式")])
-                    )
-                    # 调用父类的传统规划方法
-                    async for event in super()._run_async_impl(ctx):
+                    yield self._ev("⚠️ ADK transfer初始化失败，回退到传统模式")
+                    # 直接调用传统调度器的规划流程，跳过transfer层的重复初始化与模式提示
+                    session_state = getattr(getattr(ctx, 'session', None), 'state', None)
+                    if session_state is not None:
+                        self.set_session_state(session_state)
+                    async for event in super(ADKTransferIntegratedScheduler, self)._run_async_impl(ctx):
                         yield event
                     return
             
             # 使用ADK transfer的优化规划流程
-            planning_cycle = 1
             max_cycles = 5  # 最大规划周期数
+
+            # 目标获取阶段与委托/等待阶段流水线化：消费方取走第N轮目标后才获取第N+1轮，
+            # 获取协程最多提前一个周期，使STK查询延迟被第N轮的任务等待时间掩盖。
+            # 代价是第N+1轮目标在第N轮任务完成前获取，最多滞后一个周期，对滚动规划可以接受
+            target_queue = asyncio.Queue(maxsize=1)
+            fetch_task = asyncio.create_task(self._missile_target_fetch_worker(target_queue, max_cycles))
+
+            # 规划触发事件绑定当前事件循环，每次规划运行重新创建
+            object.__setattr__(self, '_cycle_trigger', asyncio.Event())
+
+            try:
+                async for event in self._run_planning_cycles(ctx, target_queue, fetch_task, max_cycles):
+                    yield event
+            finally:
+                object.__setattr__(self, '_cycle_trigger', None)
+                fetch_task.cancel()
+                # 等待获取协程真正结束，并取走其异常避免“未检索的异常”警告
+                await asyncio.gather(fetch_task, return_exceptions=True)
             
-            while planning_cycle <= max_cycles:
-                yield Event(
-                    author=self.name,
-                    content=types.Content(parts=[types.Part(text=f"📋 开始第 {planning_cycle} 轮ADK优化规划")])
-                )
-                
-                # 1. 生成元任务集
-                yield Event(
-                    author=self.name,
-                    content=types.Content(parts=[types.Part(text="🎯 生成元任务集...")])
-                )
-                
-                # 获取活跃导弹目标
-                missile_targets = await self._get_active_missile_targets()
-                
-                if missile_targets:
-                    # 为每个目标生成元任务并使用ADK transfer委托
-                    for missile_info in missile_targets:
-                        missile_id = missile_info.get('missile_id', 'unknown')
-                        
-                        yield Event(
-                            author=self.name,
-                            content=types.Content(parts=[types.Part(text=f"📡 为导弹 {missile_id} 委托任务（ADK transfer）")])
-                        )
-                        
-                        # 使用ADK transfer委托任务
-                        result = await self._delegate_missile_task_with_transfer(ctx, missile_info)
-                        
-                        yield Event(
-                            author=self.name,
-                            content=types.Content(parts=[types.Part(text=f"✅ 导弹 {missile_id} 任务委托结果: {result}")])
-                        )
-                
-                # 2. 等待任务完成（使用ADK transfer机制）
-                yield Event(
-                    author=self.name,
-                    content=types.Content(parts=[types.Part(text="⏳ 等待ADK transfer任务完成...")])
-                )
-                
-                await self._wait_for_all_tasks_completion()
-                
-                yield Event(
-                    author=self.name,
-                    content=types.Content(parts=[types.Part(text=f"✅ 第 {planning_cycle} 轮规划完成")])
-                )
-                
-                # 3. 检查是否需要继续规划
-                if not missile_targets:
-                    yield Event(
-                        author=self.name,
-                        content=types.Content(parts=[types.Part(text="🎯 无活跃目标，规划周期结束")])
-                    )
-                    break
-                
-                planning_cycle += 1
-                
-                # 短暂等待后开始下一轮
-                await asyncio.sleep(1)
-            
-            yield Event(
-                author=self.name,
-                content=types.Content(parts=[types.Part(text="🎉 ADK优化规划周期完成")]),
-                actions=EventActions(escalate=True)
-            )
+            yield self._ev("🎉 ADK优化规划周期完成", actions=EventActions(escalate=True))
             
         except Exception as e:
             logger.error(f"❌ ADK优化规划周期失败: {e}")
-            yield Event(
-                author=self.name,
-                content=types.Content(parts=[types.Part(text=f"❌ 规划周期失败: {e}")]),
-                actions=EventActions(escalate=True)
-            )
+            yield self._ev(f"❌ 规划周期失败: {e}", actions=EventActions(escalate=True))
+
+    async def _missile_target_fetch_worker(self, target_queue: asyncio.Queue, max_cycles: int):
+        """
+        流水线获取阶段：逐周期获取活跃导弹目标并放入队列
 
-    async def _delegate_missile_task_with_transfer(self, ctx: InvocationContext, missile_info: Dict[str, Any]) -> str:
+        每轮目标被消费方取走（task_done）后才获取下一轮，因此最多领先消费方一个周期；
+        无活跃目标时结束。
+        """
+        for _ in range(max_cycles):
+            missile_targets = await self._get_active_missile_targets()
+            await target_queue.put(missile_targets)
+            if not missile_targets:
+                return
+            await target_queue.join()
+
+    @staticmethod
+    async def _next_missile_targets(target_queue: asyncio.Queue, fetch_task: asyncio.Task) -> List[Dict[str, Any]]:
+        """
+        从获取阶段取下一周期的导弹目标
+
+        同时等待队列与获取协程：获取协程异常或提前结束时抛出异常，而不是永久阻塞在队列上
+        """
+        if target_queue.empty() and not fetch_task.done():
+            get_task = asyncio.ensure_future(target_queue.get())
+            try:
+                await asyncio.wait({get_task, fetch_task}, return_when=asyncio.FIRST_COMPLETED)
+            finally:
+                if not get_task.done():
+                    get_task.cancel()
+            if not get_task.cancelled():
+                target_queue.task_done()
+                return get_task.result()
+
+        if not target_queue.empty():
+            missile_targets = target_queue.get_nowait()
+            target_queue.task_done()
+            return missile_targets
+
+        if fetch_task.cancelled():
+            raise RuntimeError("导弹目标获取阶段已被取消")
+        fetch_task.result()  # 获取协程异常时在此重新抛出
+        raise RuntimeError("导弹目标获取阶段已提前结束")
+
+    async def _run_planning_cycles(self, ctx: InvocationContext, target_queue: asyncio.Queue,
+                                   fetch_task: asyncio.Task, max_cycles: int) -> AsyncGenerator[Event, None]:
+        """流水线委托/等待阶段：消费获取阶段产出的目标，逐周期委托并等待完成"""
+        planning_cycle = 1
+
+        while planning_cycle <= max_cycles:
+            yield self._ev(f"📋 开始第 {planning_cycle} 轮ADK优化规划")
+            
+            # 1. 生成元任务集
+            yield self._ev("🎯 生成元任务集...")
+            
+            # 获取活跃导弹目标（由获取阶段提前准备）
+            missile_targets = await self._next_missile_targets(target_queue, fetch_task)
+            
+            if missile_targets:
+                # 为每个目标生成元任务并使用ADK transfer委托
+                missile_ids = [missile_info.get('missile_id', 'unknown') for missile_info in missile_targets]
+
+                for missile_id in missile_ids:
+                    yield self._ev(f"📡 为导弹 {missile_id} 委托任务（ADK transfer）")
+
+                # 各导弹的委托相互独立，并发执行，同一批委托共用委托时间
+                delegation_time = datetime.now().isoformat()
+                results = await asyncio.gather(
+                    *(self._delegate_missile_task_with_transfer(ctx, missile_info, delegation_time)
+                      for missile_info in missile_targets),
+                    return_exceptions=True
+                )
+
+                for missile_id, result in zip(missile_ids, results):
+                    if isinstance(result, Exception):
+                        result = f"委托失败: {result}"
+                    yield self._ev(f"✅ 导弹 {missile_id} 任务委托结果: {result}")
+            
+            # 2. 等待任务完成（使用ADK transfer机制）
+            yield self._ev("⏳ 等待ADK transfer任务完成...")
+            
+            await self._wait_for_all_tasks_completion()
+            
+            yield self._ev(f"✅ 第 {planning_cycle} 轮规划完成")
+            
+            # 3. 检查是否需要继续规划
+            if not missile_targets:
+                yield self._ev("🎯 无活跃目标，规划周期结束")
+                break
+            
+            planning_cycle += 1
+            
+            # 等待规划触发后开始下一轮，最长等待1秒
+            cycle_trigger = self._cycle_trigger
+            try:
+                await asyncio.wait_for(cycle_trigger.wait(), timeout=1.0)
+            except asyncio.TimeoutError:
+                pass
+            cycle_trigger.clear()
+
+    def _build_missile_task_info(self, missile_info: Dict[str, Any], delegation_time: Optional[str] = None) -> Dict[str, Any]:
+        """
+        构建导弹跟踪任务信息
+
+        Args:
+            missile_info: 导弹信息
+            delegation_time: 委托时间（ISO格式），同一批委托可共用一个时间戳；为空时取当前时间
+        """
+        missile_id = missile_info.get('missile_id', 'unknown')
+        return {
+            'task_id': f"missile_tracking_{missile_id}_{uuid4().bytes[:4].hex()}",
+            'task_type': 'missile_tracking',
+            'description': f"跟踪导弹 {missile_id}",
+            'target_id': missile_id,
+            'priority': 0.8,
+            'metadata': {
+                'missile_info': missile_info,
+                'requires_discussion_group': True,
+                'delegation_time': delegation_time or datetime.now().isoformat()
+            }
+        }
+
+    def _get_delegate_semaphore(self) -> asyncio.Semaphore:
+        """获取绑定当前事件循环的委托并发信号量（UI每次请求使用新的事件循环）"""
+        loop = asyncio.get_running_loop()
+        if self._delegate_semaphore is None or self._delegate_semaphore_loop is not loop:
+            object.__setattr__(self, '_delegate_semaphore', asyncio.Semaphore(self._max_concurrent_delegations))
+            object.__setattr__(self, '_delegate_semaphore_loop', loop)
+        return self._delegate_semaphore
+
+    async def _delegate_missile_task_with_transfer(self, ctx: InvocationContext, missile_info: Dict[str, Any],
+                                                   delegation_time: Optional[str] = None) -> str:
         """
         使用ADK transfer委托导弹跟踪任务
         """
@@ -222,21 +323,11 @@ class ADKOptimizedScheduler(ADKTransferIntegratedScheduler):
             missile_id = missile_info.get('missile_id', 'unknown')
             
             # 构建任务信息
-            task_info = {
-                'task_id': f"missile_tracking_{missile_id}_{uuid4().hex[:8]}",
-                'task_type': 'missile_tracking',
-                'description': f"跟踪导弹 {missile_id}",
-                'target_id': missile_id,
-                'priority': 0.8,
-                'metadata': {
-                    'missile_info': missile_info,
-                    'requires_discussion_group': True,
-                    'delegation_time': datetime.now().isoformat()
-                }
-            }
+            task_info = self._build_missile_task_info(missile_info, delegation_time)
             
-            # 使用ADK transfer委托任务
-            result = await self.delegate_task_with_transfer(ctx, task_info)
+            # 使用ADK transfer委托任务（受并发上限约束）
+            async with self._get_delegate_semaphore():
+                result = await self.delegate_task_with_transfer(ctx, task_info)
             
             logger.info(f"📡 导弹 {missile_id} 任务委托结果: {result}")
             return result
@@ -245,8 +336,32 @@ class ADKOptimizedScheduler(ADKTransferIntegratedScheduler):
             logger.error(f"❌ 委托导弹任务失败: {e}")
             return f"委托失败: {e}"
 
+    async def _get_cached_missile_query(self, key: str, query) -> List[Dict[str, Any]]:
+        """在有效期内复用活跃导弹查询结果，过期后重新查询"""
+        now = time.monotonic()
+        cached = self._missile_cache.get(key)
+        if cached is not None and now - cached[0] < _MISSILE_CACHE_TTL:
+            return cached[1]
+
+        result = await query()
+        self._missile_cache[key] = (now, result)
+        return result
+
+    def invalidate_missile_cache(self):
+        """使活跃导弹查询缓存失效（如有新导弹发射或进入下一轮规划）"""
+        self._missile_cache.clear()
+
+    def notify_planning_trigger(self):
+        """触发下一轮规划时同时使导弹缓存失效"""
+        self.invalidate_missile_cache()
+        super().notify_planning_trigger()
+
     async def _get_active_missile_targets(self) -> List[Dict[str, Any]]:
         """获取活跃的导弹目标"""
+        return await self._get_cached_missile_query('targets', self._query_active_missile_targets)
+
+    async def _query_active_missile_targets(self) -> List[Dict[str, Any]]:
+        """查询活跃的导弹目标"""
         try:
             # 这里应该从STK或其他数据源获取活跃导弹
             # 暂时返回模拟数据
@@ -266,11 +381,11 @@ class ADKOptimizedScheduler(ADKTransferIntegratedScheduler):
         """获取优化状态"""
         return {
             'scheduler_type': 'ADKOptimizedScheduler',
-            'transfer_enabled': getattr(self, '_transfer_enabled', False),
-            'auto_initialize': getattr(self, '_auto_initialize_transfer', False),
-            'satellite_count': len(getattr(self, 'sub_agents', [])),
-            'pending_tasks': len(getattr(self, '_pending_tasks', set())),
-            'session_state_available': hasattr(self, '_session_state') and self._session_state is not None
+            'transfer_enabled': self._transfer_enabled,
+            'auto_initialize': self._auto_initialize_transfer,
+            'satellite_count': len(self.sub_agents),
+            'pending_tasks': len(self._pending_tasks),
+            'session_state_available': self._session_state is not None
         }
 
     def _create_optimized_tools(self) -> List[FunctionTool]:
@@ -326,27 +441,29 @@ class ADKOptimizedScheduler(ADKTransferIntegratedScheduler):
                 if active_missiles:
                     planning_result += f"📡 发现 {len(active_missiles)} 个活跃导弹目标\n"
 
-                    # 使用ADK transfer委托任务
-                    for missile_info in active_missiles:
+                    # 同一批委托共用委托时间
+                    delegation_time = datetime.now().isoformat()
+
+                    async def _delegate_one(missile_info: Dict[str, Any]) -> str:
                         missile_id = missile_info.get('missile_id', 'unknown')
 
                         # 构建任务信息
-                        task_info = {
-                            'task_id': f"missile_tracking_{missile_id}_{uuid4().hex[:8]}",
-                            'task_type': 'missile_tracking',
-                            'description': f"跟踪导弹 {missile_id}",
-                            'target_id': missile_id,
-                            'priority': 0.8,
-                            'metadata': {
-                                'missile_info': missile_info,
-                                'requires_discussion_group': True,
-                                'delegation_time': datetime.now().isoformat()
-                            }
-                        }
-
-                        # 使用ADK transfer委托任务
-                        result = await self.delegate_task_with_transfer(None, task_info)
-                        planning_result += f"📡 导弹 {missile_id} 任务委托: {result}\n"
+                        task_info = self._build_missile_task_info(missile_info, delegation_time)
+
+                        # 使用ADK transfer委托任务（受并发上限约束）
+                        async with self._get_delegate_semaphore():
+                            result = await self.delegate_task_with_transfer(None, task_info)
+                        return f"📡 导弹 {missile_id} 任务委托: {result}\n"
+
+                    # 各导弹的委托相互独立，并发执行
+                    results = await asyncio.gather(
+                        *(_delegate_one(missile_info) for missile_info in active_missiles),
+                        return_exceptions=True
+                    )
+                    for missile_info, result in zip(active_missiles, results):
+                        if isinstance(result, Exception):
+                            result = f"📡 导弹 {missile_info.get('missile_id', 'unknown')} 任务委托: 委托失败: {result}\n"
+                        planning_result += result
                 else:
                     planning_result += "📊 当前无活跃导弹目标，执行常规巡逻任务\n"
 
@@ -360,15 +477,15 @@ class ADKOptimizedScheduler(ADKTransferIntegratedScheduler):
 
         # 3. 继承传统调度器的其他工具
         try:
-            # 获取父类的工具
-            parent_tools = super()._create_tools()
+            # 获取父类的工具：父类初始化时已创建，无需重新构建
+            parent_tools = self._parent_tools or super()._create_tools()
 
             # 过滤掉重复的工具，保留传统功能
             for tool in parent_tools:
                 if hasattr(tool, 'func') and hasattr(tool.func, '__name__'):
                     func_name = tool.func.__name__
                     # 跳过已经优化的工具
-                    if func_name not in ['initialize_complete_system']:
+                    if func_name not in _OPTIMIZED_TOOL_NAMES:
                         tools.append(tool)
                         logger.debug(f"✅ 继承传统工具: {func_name}")
 
@@ -380,6 +497,10 @@ class ADKOptimizedScheduler(ADKTransferIntegratedScheduler):
 
     async def _get_active_missiles_with_trajectories(self) -> List[Dict[str, Any]]:
         """获取活跃导弹及其轨迹信息（继承传统方法）"""
+        return await self._get_cached_missile_query('trajectories', self._query_active_missiles_with_trajectories)
+
+    async def _query_active_missiles_with_trajectories(self) -> List[Dict[str, Any]]:
+        """查询活跃导弹及其轨迹信息"""
         try:
             # 调用父类的方法获取活跃导弹
             if hasattr(super(), '_get_active_missiles_with_trajectories'):
@@ -4,9 +4,13 @@ ADK transfer_to_agent与现有具身智能体的集成方案
 """
 
 import asyncio
+import itertools
 import logging
+import sys
+import time
+import weakref
 from datetime import datetime, timedelta
-from typing import Dict, List, Any, Optional, AsyncGenerator
+from typing import Dict, List, Any, Optional, AsyncGenerator, Tuple
 from uuid import uuid4
 
 from google.adk.agents import LlmAgent, BaseAgent
@@ -15,11 +19,146 @@ from google.adk.events import Event, EventActions
 from google.genai import types
 
 from .simulation_scheduler_agent import SimulationSchedulerAgent
-from .satellite_agent import SatelliteAgent
+from .satellite_agent import SatelliteAgent, TaskInfo
 
 logger = logging.getLogger(__name__)
 
 
+def _extract_missile_targets(source: Dict[str, Any], include_missile_list: bool = True) -> Optional[Tuple[str, List[Any]]]:
+    """
+    从任务数据中提取导弹目标
+
+    依次查找missile_target_names与（兼容旧格式的）missile_list，以第一个导弹作为主要目标。
+
+    Returns:
+        (主要目标ID, 导弹目标名称列表)；两个键都不存在时返回None
+    """
+    if 'missile_target_names' in source:
+        missile_target_names = source['missile_target_names']
+        return (missile_target_names[0] if missile_target_names else 'unknown'), missile_target_names
+
+    if include_missile_list and 'missile_list' in source:
+        missile_list = source['missile_list']
+        if not missile_list:
+            return 'unknown', []
+        if isinstance(missile_list[0], dict):
+            missile_target_names = [m.get('missile_id', f'missile_{i}') for i, m in enumerate(missile_list)]
+            return missile_list[0].get('missile_id', 'unknown'), missile_target_names
+        return missile_list[0], missile_list
+
+    return None
+
+
+# 智能体类名缓存：卫星智能体类型单一，按类型缓存__name__
+_TYPE_NAME_CACHE: Dict[type, str] = {}
+
+
+def _type_name(obj: Any, _cache=_TYPE_NAME_CACHE) -> str:
+    """返回对象的类名（按类型缓存）"""
+    obj_type = type(obj)
+    name = _cache.get(obj_type)
+    if name is None:
+        name = _cache[obj_type] = obj_type.__name__
+    return name
+
+
+def _satellite_discussion_info(satellite_id: str, satellite_agent: Any, _getattr=getattr) -> Dict[str, Any]:
+    """构建讨论组创建所需的单个卫星智能体信息（getattr以默认参数绑定为局部名）"""
+    return {
+        'id': satellite_id,
+        'name': _getattr(satellite_agent, 'name', satellite_id),
+        'satellite_id': _getattr(satellite_agent, 'satellite_id', satellite_id),
+        'available': True,
+        'agent_type': _type_name(satellite_agent)
+    }
+
+
+# 固定状态消息的预构建内容，避免每次产生事件时重复构造Content/Part
+_STATIC_CONTENT = {
+    text: types.Content(parts=[types.Part(text=text)])
+    for text in (
+        "🚀 启动ADK transfer优化的仿真调度智能体",
+        "🔄 使用传统模式运行仿真调度智能体",
+        "🚀 所有transfer任务完成，触发下一轮规划",
+    )
+}
+
+# 智能体缺少轨道/载荷配置时的共享空字典（只读）
+_EMPTY_CONFIG: Dict[str, Any] = {}
+
+# 委托目标索引中未指定目标卫星的委托使用的键（session.state需可JSON持久化，不能以None为键）
+_UNTARGETED_DELEGATION_KEY = '*'
+
+# ADK transfer模式的调度器指令模板（{agents_list}为卫星智能体描述列表）
+_TRANSFER_INSTRUCTION_TMPL = """
+你是仿真调度智能体，负责协调卫星任务执行和滚动规划。
+
+可用的具身卫星智能体：
+{agents_list}
+
+ADK Transfer模式特性：
+1. 使用transfer_to_agent将任务委托给具身卫星智能体
+2. 每颗卫星都保持完整的具身特性（轨道参数、STK连接、可见性计算）
+3. 每颗卫星都可能成为组长，创建讨论组进行协同决策
+4. 通过session.state实现实时结果回收和规划触发
+
+任务委托策略：
+- 单目标任务：选择最近或最优可见性的卫星
+- 多目标任务：选择覆盖范围最优的卫星组合
+- 协同任务：委托给最合适的卫星作为组长
+
+使用transfer_to_agent的格式：
+transfer_to_agent(agent_name='目标卫星智能体名称')
+
+结果管理：
+- 任务结果：session.state['task_results'][task_id] = 结果
+- 规划触发：session.state['planning_trigger'] = True
+- 讨论组状态：session.state['discussion_groups'][group_id] = 状态
+
+原有功能保持：
+- STK场景管理
+- 滚动规划周期
+- 元任务生成
+- 结果收集和甘特图生成
+"""
+
+# 指定目标卫星时的任务委托提示模板
+_TARGETED_DELEGATION_PROMPT_TMPL = """
+需要将以下任务委托给指定的卫星智能体：
+
+任务信息：
+- 任务ID: {task_id}
+- 任务类型: {task_type}
+- 任务描述: {task_description}
+- 指定卫星: {target_satellite_id}
+
+请使用transfer_to_agent将任务委托给卫星 {target_satellite_id}：
+transfer_to_agent(agent_name='{target_satellite_id}')
+"""
+
+# 由LLM自动选择卫星时的任务委托提示模板
+_AUTO_DELEGATION_PROMPT_TMPL = """
+需要为以下任务选择最合适的卫星智能体：
+
+任务信息：
+- 任务ID: {task_id}
+- 任务类型: {task_type}
+- 任务描述: {task_description}
+- 目标位置: {target_position}
+- 优先级: {priority}
+
+请分析任务需求，选择最合适的卫星智能体，并使用transfer_to_agent进行委托。
+
+选择策略：
+1. 考虑卫星的轨道参数和可见性
+2. 考虑卫星的载荷配置和能力
+3. 考虑当前任务负载和可用性
+4. 如需协同，选择最适合作为组长的卫星
+
+请调用：transfer_to_agent(agent_name='选定的卫星智能体名称')
+"""
+
+
 class ADKTransferIntegratedScheduler(SimulationSchedulerAgent):
     """
     集成ADK transfer_to_agent的仿真调度智能体
@@ -44,6 +183,30 @@ class ADKTransferIntegratedScheduler(SimulationSchedulerAgent):
         object.__setattr__(self, '_satellite_sub_agents', [])
         object.__setattr__(self, '_transfer_instruction_updated', False)
         object.__setattr__(self, '_pending_tasks', set())
+        object.__setattr__(self, '_session_state', None)
+        object.__setattr__(self, '_needs_transfer_init', False)
+        # 可用卫星列表缓存：(来源版本, 去重后的卫星列表)，initialize_adk_transfer_mode时版本递增
+        object.__setattr__(self, '_satellites_version', 0)
+        object.__setattr__(self, '_all_satellites_cache', None)
+        # 卫星索引缓存：(对应的卫星列表, {satellite_id/name: (位置, 卫星智能体)})
+        object.__setattr__(self, '_satellite_index_cache', None)
+        # 卫星命名映射缓存（配置在运行期间不变，重新加载配置时需调用invalidate_satellite_mapping_cache）
+        object.__setattr__(self, '_satellite_mapping_cache', None)
+        # 预期卫星名称缓存：(来源命名映射, 名称列表)，命名映射缓存失效后重新生成
+        object.__setattr__(self, '_expected_names_cache', None)
+        # transfer指令缓存：(卫星描述键, 指令文本)
+        object.__setattr__(self, '_transfer_instruction_cache', None)
+        # 本轮规划的可用卫星信息缓存，等待本轮任务完成后失效
+        object.__setattr__(self, '_cycle_satellite_info_cache', None)
+        object.__setattr__(self, '_cycle_id', 0)
+        # 委托ID：实例前缀（区分共用session.state的不同调度器）+ 单调计数
+        object.__setattr__(self, '_delegation_prefix', uuid4().hex[:4])
+        object.__setattr__(self, '_delegation_seq', itertools.count())
+        # 任务完成Future：由卫星写入task_results后通知，替代轮询session.state
+        object.__setattr__(self, '_task_completion_futures', {})
+        # 规划触发事件：session.state['planning_trigger']置位时同步设置；
+        # 由每次规划运行在其事件循环中创建（UI每次请求使用新的事件循环），未运行时为None
+        object.__setattr__(self, '_cycle_trigger', None)
         
         logger.info("✅ ADK Transfer集成调度器初始化完成")
 
@@ -65,13 +228,19 @@ class ADKTransferIntegratedScheduler(SimulationSchedulerAgent):
             # 2. 设置为sub_agents（使用object.__setattr__绕过Pydantic限制）
             object.__setattr__(self, 'sub_agents', satellite_agents)
             object.__setattr__(self, '_satellite_sub_agents', satellite_agents)
+            object.__setattr__(self, '_satellites_version', self._satellites_version + 1)
             
             # 3. 更新指令以支持transfer_to_agent
             self._update_instruction_for_transfer(satellite_agents)
             
-            # 4. 为每个卫星智能体启用transfer接收模式
-            for satellite in satellite_agents:
-                await self._enable_satellite_transfer_mode(satellite)
+            # 4. 为每个卫星智能体启用transfer接收模式（各卫星相互独立，并发执行）
+            results = await asyncio.gather(
+                *(self._enable_satellite_transfer_mode(satellite) for satellite in satellite_agents),
+                return_exceptions=True
+            )
+            for satellite, result in zip(satellite_agents, results):
+                if isinstance(result, Exception):
+                    logger.error(f"❌ 为卫星 {satellite.satellite_id} 启用transfer模式失败: {result}")
             
             object.__setattr__(self, '_transfer_enabled', True)
             
@@ -85,44 +254,39 @@ class ADKTransferIntegratedScheduler(SimulationSchedulerAgent):
     async def _get_existing_satellite_agents(self) -> List[SatelliteAgent]:
         """获取现有的具身卫星智能体"""
         try:
-            satellite_agents = []
-            
-            # 从现有的卫星智能体注册表获取
-            if hasattr(self, '_satellite_agents') and self._satellite_agents:
-                for sat_id, agent in self._satellite_agents.items():
+            # 按satellite_id去重收集，保持发现顺序
+            collected: Dict[str, SatelliteAgent] = {}
+
+            def _collect(agents):
+                for agent in agents:
                     if isinstance(agent, SatelliteAgent):
-                        satellite_agents.append(agent)
-                        logger.info(f"📡 发现具身卫星智能体: {agent.name} (ID: {sat_id})")
-            
+                        collected.setdefault(agent.satellite_id, agent)
+
+            # 从现有的卫星智能体注册表获取
+            if self._satellite_agents:
+                _collect(self._satellite_agents.values())
+
             # 从多智能体系统获取
-            if hasattr(self, '_multi_agent_system') and self._multi_agent_system:
+            if self._multi_agent_system:
                 # 从卫星智能体注册表获取
                 if hasattr(self._multi_agent_system, '_satellite_agents'):
-                    for satellite_id, agent_instance in self._multi_agent_system._satellite_agents.items():
-                        if isinstance(agent_instance, SatelliteAgent) and agent_instance not in satellite_agents:
-                            satellite_agents.append(agent_instance)
-                            logger.info(f"📡 从多智能体系统发现: {agent_instance.name}")
+                    _collect(self._multi_agent_system._satellite_agents.values())
 
                 # 如果没有找到，尝试从satellite_agents属性获取
-                if not satellite_agents and hasattr(self._multi_agent_system, 'satellite_agents'):
-                    satellite_agents_dict = self._multi_agent_system.satellite_agents
-                    for satellite_id, agent_instance in satellite_agents_dict.items():
-                        if isinstance(agent_instance, SatelliteAgent) and agent_instance not in satellite_agents:
-                            satellite_agents.append(agent_instance)
-                            logger.info(f"📡 从属性发现: {agent_instance.name}")
+                if not collected and hasattr(self._multi_agent_system, 'satellite_agents'):
+                    _collect(self._multi_agent_system.satellite_agents.values())
 
             # 3. 从传统调度器的工具方法获取（重要！）
-            if not satellite_agents:
+            if not collected:
                 try:
                     # 调用传统调度器的获取卫星方法
-                    traditional_satellites = self._get_available_satellite_agents()
-                    for agent in traditional_satellites:
-                        if isinstance(agent, SatelliteAgent) and agent not in satellite_agents:
-                            satellite_agents.append(agent)
-                            logger.info(f"📡 从传统方法发现: {agent.name}")
+                    _collect(self._get_available_satellite_agents())
                 except Exception as e:
                     logger.debug(f"传统方法获取卫星失败: {e}")
 
+            satellite_agents = list(collected.values())
+            if collected:
+                logger.info("📡 发现具身卫星智能体: %s", ", ".join(collected))
             logger.info(f"🛰️ 总共发现 {len(satellite_agents)} 个具身卫星智能体")
             return satellite_agents
             
@@ -133,53 +297,33 @@ class ADKTransferIntegratedScheduler(SimulationSchedulerAgent):
     def _update_instruction_for_transfer(self, satellite_agents: List[SatelliteAgent]):
         """更新指令以支持transfer_to_agent"""
         try:
+            # 卫星集合及其轨道/载荷配置未变化时复用已构建的指令
+            instruction_key = tuple(
+                (agent.satellite_id, id(getattr(agent, 'orbital_parameters', None)), id(getattr(agent, 'payload_config', None)))
+                for agent in satellite_agents
+            )
+            cached = self._transfer_instruction_cache
+            if cached is not None and cached[0] == instruction_key:
+                object.__setattr__(self, 'instruction', cached[1])
+                object.__setattr__(self, '_transfer_instruction_updated', True)
+                logger.info("✅ 卫星智能体未变化，复用已构建的ADK transfer指令")
+                return
+
             # 构建卫星智能体描述
-            agent_descriptions = []
-            for agent in satellite_agents:
-                agent_descriptions.append(
-                    f"- {agent.name}: 卫星 {agent.satellite_id}，"
-                    f"轨道参数: {getattr(agent, 'orbital_parameters', {})}, "
-                    f"载荷配置: {getattr(agent, 'payload_config', {})}"
-                )
-            
-            agents_list = "\n".join(agent_descriptions)
+            agents_list = "\n".join(
+                f"- {agent.name}: 卫星 {agent.satellite_id}，"
+                f"轨道参数: {getattr(agent, 'orbital_parameters', _EMPTY_CONFIG)}, "
+                f"载荷配置: {getattr(agent, 'payload_config', _EMPTY_CONFIG)}"
+                for agent in satellite_agents
+            )
             
             # 构建新的指令
-            transfer_instruction = f"""
-你是仿真调度智能体，负责协调卫星任务执行和滚动规划。
-
-可用的具身卫星智能体：
-{agents_list}
-
-ADK Transfer模式特性：
-1. 使用transfer_to_agent将任务委托给具身卫星智能体
-2. 每颗卫星都保持完整的具身特性（轨道参数、STK连接、可见性计算）
-3. 每颗卫星都可能成为组长，创建讨论组进行协同决策
-4. 通过session.state实现实时结果回收和规划触发
-
-任务委托策略：
-- 单目标任务：选择最近或最优可见性的卫星
-- 多目标任务：选择覆盖范围最优的卫星组合
-- 协同任务：委托给最合适的卫星作为组长
-
-使用transfer_to_agent的格式：
-transfer_to_agent(agent_name='目标卫星智能体名称')
-
-结果管理：
-- 任务结果：session.state['task_results'][task_id] = 结果
-- 规划触发：session.state['planning_trigger'] = True
-- 讨论组状态：session.state['discussion_groups'][group_id] = 状态
-
-原有功能保持：
-- STK场景管理
-- 滚动规划周期
-- 元任务生成
-- 结果收集和甘特图生成
-"""
+            transfer_instruction = _TRANSFER_INSTRUCTION_TMPL.format(agents_list=agents_list)
             
             # 更新指令（使用object.__setattr__）
             object.__setattr__(self, 'instruction', transfer_instruction)
             object.__setattr__(self, '_transfer_instruction_updated', True)
+            object.__setattr__(self, '_transfer_instruction_cache', (instruction_key, transfer_instruction))
             
             logger.info("✅ 指令已更新以支持ADK transfer_to_agent")
             
@@ -194,7 +338,8 @@ transfer_to_agent(agent_name='目标卫星智能体名称')
             
             # 设置transfer标识
             object.__setattr__(satellite, '_transfer_enabled', True)
-            object.__setattr__(satellite, '_parent_scheduler', self)
+            # 弱引用回指调度器，避免调度器与卫星智能体之间形成引用环
+            object.__setattr__(satellite, '_parent_scheduler_ref', weakref.ref(self))
             
             logger.info(f"✅ 卫星 {satellite.satellite_id} 已启用transfer接收模式")
             
@@ -218,6 +363,21 @@ transfer_to_agent(agent_name='目标卫星智能体名称')
         Returns:
             委托结果
         """
+        _, message = await self._delegate_task_with_status(ctx, task_info, target_satellite_id)
+        return message
+
+    async def _delegate_task_with_status(
+        self,
+        ctx: Optional[InvocationContext],
+        task_info: Dict[str, Any],
+        target_satellite_id: Optional[str] = None
+    ) -> Tuple[bool, str]:
+        """
+        委托任务并返回结构化结果
+
+        Returns:
+            (是否委托成功, 委托结果描述)
+        """
         try:
             if not self._transfer_enabled:
                 logger.warning("⚠️ ADK transfer模式未启用，回退到传统方式")
@@ -225,35 +385,34 @@ transfer_to_agent(agent_name='目标卫星智能体名称')
             
             logger.info(f"📡 使用ADK transfer委托任务: {task_info.get('task_id')}")
             
-            # 准备任务委托信息
-            delegation_info = {
-                'task_info': task_info,
-                'delegation_time': datetime.now().isoformat(),
-                'target_satellite_id': target_satellite_id,
-                'delegation_mode': 'adk_transfer'
-            }
-            
             # 保存到session.state供LLM读取
-            session_state = None
-            if ctx and hasattr(ctx, 'session') and hasattr(ctx.session, 'state'):
-                session_state = ctx.session.state
-            elif hasattr(self, '_session_state'):
+            session_state = getattr(getattr(ctx, 'session', None), 'state', None)
+            if session_state is None:
                 session_state = self._session_state
 
-            if session_state is not None:
-                if 'pending_delegations' not in session_state:
-                    session_state['pending_delegations'] = {}
-
-                delegation_id = f"delegation_{uuid4().hex[:8]}"
-                session_state['pending_delegations'][delegation_id] = delegation_info
-            else:
+            if session_state is None:
                 # 如果没有session.state，直接委托给目标卫星
-                delegation_id = f"direct_delegation_{uuid4().hex[:8]}"
+                delegation_id = f"direct_delegation_{self._delegation_prefix}{next(self._delegation_seq):06x}"
                 logger.info(f"⚠️ 没有session.state，直接委托任务: {delegation_id}")
 
                 # 直接执行任务委托
-                result = await self._execute_direct_delegation(task_info, target_satellite_id)
-                return result
+                return await self._execute_direct_delegation(task_info, target_satellite_id)
+
+            # 准备任务委托信息（优先复用任务构建时已记录的委托时间）
+            delegation_time = task_info.get('metadata', {}).get('delegation_time') or datetime.now().isoformat()
+            delegation_info = {
+                'task_info': task_info,
+                'delegation_time': delegation_time,
+                'target_satellite_id': target_satellite_id,
+                'delegation_mode': 'adk_transfer'
+            }
+
+            delegation_id = f"delegation_{self._delegation_prefix}{next(self._delegation_seq):06x}"
+            session_state.setdefault('pending_delegations', {})[delegation_id] = delegation_info
+            # 按目标卫星索引委托，卫星侧只需查看属于自己的委托
+            session_state.setdefault('delegations_by_target', {}).setdefault(
+                target_satellite_id or _UNTARGETED_DELEGATION_KEY, []
+            ).append(delegation_id)
 
             # 构建委托提示，让LLM决定使用哪个卫星
             delegation_prompt = self._build_task_delegation_prompt(task_info, target_satellite_id)
@@ -262,11 +421,11 @@ transfer_to_agent(agent_name='目标卫星智能体名称')
             # ADK框架会自动处理transfer调用，将执行转移到目标卫星智能体
 
             logger.info(f"✅ 任务委托准备完成: {delegation_id}")
-            return f"任务委托准备完成，等待LLM选择目标卫星智能体"
+            return True, "任务委托准备完成，等待LLM选择目标卫星智能体"
             
         except Exception as e:
             logger.error(f"❌ ADK transfer任务委托失败: {e}")
-            return f"❌ 任务委托失败: {e}"
+            return False, f"❌ 任务委托失败: {e}"
 
     def _build_task_delegation_prompt(
         self, 
@@ -274,45 +433,17 @@ transfer_to_agent(agent_name='目标卫星智能体名称')
         target_satellite_id: Optional[str] = None
     ) -> str:
         """构建任务委托提示"""
-        task_description = task_info.get('description', '未知任务')
-        task_type = task_info.get('task_type', 'unknown')
-        
-        if target_satellite_id:
-            return f"""
-需要将以下任务委托给指定的卫星智能体：
-
-任务信息：
-- 任务ID: {task_info.get('task_id')}
-- 任务类型: {task_type}
-- 任务描述: {task_description}
-- 指定卫星: {target_satellite_id}
-
-请使用transfer_to_agent将任务委托给卫星 {target_satellite_id}：
-transfer_to_agent(agent_name='{target_satellite_id}')
-"""
-        else:
-            return f"""
-需要为以下任务选择最合适的卫星智能体：
-
-任务信息：
-- 任务ID: {task_info.get('task_id')}
-- 任务类型: {task_type}
-- 任务描述: {task_description}
-- 目标位置: {task_info.get('target_position', '未知')}
-- 优先级: {task_info.get('priority', 0.5)}
-
-请分析任务需求，选择最合适的卫星智能体，并使用transfer_to_agent进行委托。
-
-选择策略：
-1. 考虑卫星的轨道参数和可见性
-2. 考虑卫星的载荷配置和能力
-3. 考虑当前任务负载和可用性
-4. 如需协同，选择最适合作为组长的卫星
-
-请调用：transfer_to_agent(agent_name='选定的卫星智能体名称')
-"""
-
-    async def _delegate_task_traditional(self, task_info: Dict[str, Any]) -> str:
+        template = _TARGETED_DELEGATION_PROMPT_TMPL if target_satellite_id else _AUTO_DELEGATION_PROMPT_TMPL
+        return template.format_map({
+            'task_id': task_info.get('task_id'),
+            'task_type': task_info.get('task_type', 'unknown'),
+            'task_description': task_info.get('description', '未知任务'),
+            'target_satellite_id': target_satellite_id,
+            'target_position': task_info.get('target_position', '未知'),
+            'priority': task_info.get('priority', 0.5),
+        })
+
+    async def _delegate_task_traditional(self, task_info: Dict[str, Any]) -> Tuple[bool, str]:
         """传统任务委托方式（回退机制）"""
         try:
             # 使用原有的任务发送机制
@@ -322,19 +453,19 @@ transfer_to_agent(agent_name='{target_satellite_id}')
             # 这里调用原有的任务发送逻辑
             # 具体实现取决于现有的代码结构
             
-            return f"使用传统方式委托任务: {task_id}"
+            return True, f"使用传统方式委托任务: {task_id}"
             
         except Exception as e:
             logger.error(f"❌ 传统任务委托失败: {e}")
-            return f"❌ 传统任务委托失败: {e}"
+            return False, f"❌ 传统任务委托失败: {e}"
 
     def get_transfer_status(self) -> Dict[str, Any]:
         """获取ADK transfer状态"""
         return {
-            'transfer_enabled': getattr(self, '_transfer_enabled', False),
-            'satellite_count': len(getattr(self, '_satellite_sub_agents', [])),
-            'instruction_updated': getattr(self, '_transfer_instruction_updated', False),
-            'sub_agents_count': len(getattr(self, 'sub_agents', []))
+            'transfer_enabled': self._transfer_enabled,
+            'satellite_count': len(self._satellite_sub_agents),
+            'instruction_updated': self._transfer_instruction_updated,
+            'sub_agents_count': len(self.sub_agents)
         }
 
     # 重写传统的任务发送方法，使用ADK transfer机制
@@ -357,8 +488,11 @@ transfer_to_agent(agent_name='{target_satellite_id}')
             satellite_id = satellite.get('id')
             logger.info(f"📡 使用ADK transfer发送元任务集给卫星 {satellite_id}")
 
-            # 获取所有可用的卫星智能体信息（用于讨论组创建）
-            available_satellites = await self._get_available_satellite_info_for_discussion()
+            # 获取所有可用的卫星智能体信息（用于讨论组创建），同一轮规划内复用
+            available_satellites = self._cycle_satellite_info_cache
+            if available_satellites is None:
+                available_satellites = await self._get_available_satellite_info_for_discussion()
+                object.__setattr__(self, '_cycle_satellite_info_cache', available_satellites)
 
             # 构建任务信息
             task_info = {
@@ -376,19 +510,24 @@ transfer_to_agent(agent_name='{target_satellite_id}')
                     'requires_discussion_group': True,
                     'discussion_mode': 'iterative_refinement',
                     # 传递多智能体系统引用信息
-                    'multi_agent_system_available': hasattr(self, '_multi_agent_system') and self._multi_agent_system is not None
+                    'multi_agent_system_available': self._multi_agent_system is not None
                 }
             }
 
+            # 委托前登记完成Future，避免委托过程中即完成的任务通知丢失
+            task_id = task_info['task_id']
+            self._get_task_completion_future(task_id)
+
             # 使用ADK transfer委托任务
-            result = await self.delegate_task_with_transfer(None, task_info, satellite_id)
+            delegated, result = await self._delegate_task_with_status(None, task_info, satellite_id)
 
-            if "成功" in result or "完成" in result or "委托" in result:
+            if delegated:
                 # 将任务添加到待完成列表（保持兼容性）
-                self._pending_tasks.add(task_info['task_id'])
-                logger.info(f"📋 任务 {task_info['task_id']} 已添加到待完成列表，总数: {len(self._pending_tasks)}")
+                self._pending_tasks.add(task_id)
+                logger.info(f"📋 任务 {task_id} 已添加到待完成列表，总数: {len(self._pending_tasks)}")
                 return "success"
             else:
+                self._task_completion_futures.pop(task_id, None)
                 logger.error(f"❌ ADK transfer委托失败: {result}")
                 return "transfer_failed"
 
@@ -400,7 +539,7 @@ transfer_to_agent(agent_name='{target_satellite_id}')
     async def _wait_for_all_tasks_completion(self):
         """
         使用ADK transfer机制等待所有任务完成
-        替代传统的轮询机制
+        替代传统的轮询机制：每个待完成任务对应一个Future，任务完成时由通知方直接唤醒
         """
         try:
             if not self._transfer_enabled:
@@ -409,45 +548,61 @@ transfer_to_agent(agent_name='{target_satellite_id}')
 
             logger.info("🔄 使用ADK transfer机制等待任务完成...")
 
-            # 检查session.state中的任务结果
-            max_wait_time = 300  # 5分钟超时
-            check_interval = 2   # 2秒检查一次
-            elapsed_time = 0
+            max_wait_time = 300      # 5分钟超时
+            progress_interval = 30   # 每30秒记录一次进度
+            session_state = self._session_state
 
-            while elapsed_time < max_wait_time:
-                # 检查是否有planning_trigger
-                if hasattr(self, '_session_state') and self._session_state:
-                    if self._session_state.get('planning_trigger', False):
+            # 已经写入session.state的任务结果直接视为完成
+            task_results = session_state.get('task_results', {}) if session_state else {}
+            completed_tasks = self._pending_tasks & task_results.keys()
+            if completed_tasks:
+                logger.info("✅ 通过ADK transfer完成: %s", completed_tasks)
+                self._pending_tasks -= completed_tasks
+
+            waiters = {task_id: self._get_task_completion_future(task_id) for task_id in self._pending_tasks}
+            start_time = time.monotonic()
+
+            try:
+                while waiters:
+                    # 检查是否有planning_trigger
+                    if session_state and session_state.get('planning_trigger', False):
                         logger.info("✅ 检测到planning_trigger，所有任务已完成")
                         # 重置触发器
-                        self._session_state['planning_trigger'] = False
+                        session_state['planning_trigger'] = False
                         break
 
-                # 检查任务结果
-                completed_tasks = set()
-                if hasattr(self, '_session_state') and self._session_state:
-                    task_results = self._session_state.get('task_results', {})
-                    for task_id in list(self._pending_tasks):
-                        if task_id in task_results:
-                            completed_tasks.add(task_id)
-                            logger.info(f"✅ 任务 {task_id} 通过ADK transfer完成")
-
-                # 移除已完成的任务
-                self._pending_tasks -= completed_tasks
-
-                # 如果所有任务都完成了
-                if len(self._pending_tasks) == 0:
-                    logger.info("✅ 所有ADK transfer任务已完成")
-                    break
-
-                # 等待一段时间后再检查
-                await asyncio.sleep(check_interval)
-                elapsed_time += check_interval
+                    remaining_time = max_wait_time - (time.monotonic() - start_time)
+                    if remaining_time <= 0:
+                        break
 
-                if elapsed_time % 30 == 0:  # 每30秒记录一次进度
-                    logger.info(f"⏳ 等待ADK transfer任务完成: {len(self._pending_tasks)} 个任务待完成")
+                    done, _ = await asyncio.wait(
+                        waiters.values(),
+                        timeout=min(progress_interval, remaining_time)
+                    )
 
-            if len(self._pending_tasks) > 0:
+                    # 移除已完成的任务
+                    for task_id in [task_id for task_id, future in waiters.items() if future in done]:
+                        del waiters[task_id]
+                        self._pending_tasks.discard(task_id)
+                        logger.info(f"✅ 任务 {task_id} 通过ADK transfer完成")
+
+                    if waiters:
+                        logger.info(f"⏳ 等待ADK transfer任务完成: {len(self._pending_tasks)} 个任务待完成")
+            finally:
+                # 清理本轮等待过的Future，以及等待开始前已完成（不再待完成）的任务Future
+                for task_id in completed_tasks.union(waiters):
+                    self._task_completion_futures.pop(task_id, None)
+                for task_id in [task_id for task_id, future in self._task_completion_futures.items()
+                                if future.done() and task_id not in self._pending_tasks]:
+                    del self._task_completion_futures[task_id]
+
+            # 本轮结束，可用卫星信息缓存失效
+            object.__setattr__(self, '_cycle_satellite_info_cache', None)
+            object.__setattr__(self, '_cycle_id', self._cycle_id + 1)
+
+            if len(self._pending_tasks) == 0:
+                logger.info("✅ 所有ADK transfer任务已完成")
+            else:
                 logger.warning(f"⚠️ 超时：仍有 {len(self._pending_tasks)} 个任务未完成")
 
         except Exception as e:
@@ -455,7 +610,39 @@ transfer_to_agent(agent_name='{target_satellite_id}')
             # 回退到传统方式
             await super()._wait_for_all_tasks_completion()
 
-    async def _execute_direct_delegation(self, task_info: Dict[str, Any], target_satellite_id: Optional[str] = None) -> str:
+    def _get_task_completion_future(self, task_id: str) -> asyncio.Future:
+        """获取（必要时创建）任务完成Future"""
+        future = self._task_completion_futures.get(task_id)
+        if future is None:
+            future = asyncio.get_running_loop().create_future()
+            self._task_completion_futures[task_id] = future
+        return future
+
+    def notify_transfer_task_completed(self, task_id: str):
+        """
+        通知任务已完成，唤醒等待该任务的协程
+
+        由卫星智能体在写入session.state['task_results']后调用
+        """
+        future = self._task_completion_futures.get(task_id)
+        if future is not None and not future.done():
+            future.set_result(task_id)
+
+    def notify_planning_trigger(self):
+        """
+        通知已触发下一轮规划，唤醒等待规划触发的协程
+
+        由卫星智能体在设置session.state['planning_trigger']后调用
+        """
+        if self._cycle_trigger is not None:
+            self._cycle_trigger.set()
+
+    async def _on_task_completed(self, completion_result):
+        """处理任务完成通知，同时唤醒ADK transfer等待"""
+        await super()._on_task_completed(completion_result)
+        self.notify_transfer_task_completed(completion_result.task_id)
+
+    async def _execute_direct_delegation(self, task_info: Dict[str, Any], target_satellite_id: Optional[str] = None) -> Tuple[bool, str]:
         """
         直接执行任务委托（当没有session.state时）
 
@@ -464,7 +651,7 @@ transfer_to_agent(agent_name='{target_satellite_id}')
             target_satellite_id: 目标卫星ID
 
         Returns:
-            委托结果
+            (是否委托成功, 委托结果描述)
         """
         try:
             logger.info(f"🔄 直接委托任务: {task_info.get('task_id')}")
@@ -476,7 +663,7 @@ transfer_to_agent(agent_name='{target_satellite_id}')
                 target_satellite = self._find_satellite_by_id(target_satellite_id)
             else:
                 # 自动选择最合适的卫星（简单策略：选择第一个可用的）
-                available_satellites = getattr(self, 'sub_agents', [])
+                available_satellites = self.sub_agents
                 if available_satellites:
                     target_satellite = available_satellites[0]
 
@@ -485,7 +672,7 @@ transfer_to_agent(agent_name='{target_satellite_id}')
                 logger.error(error_msg)
 
                 # 提供调试信息
-                available_satellites = getattr(self, 'sub_agents', [])
+                available_satellites = self.sub_agents
                 if available_satellites:
                     logger.error(f"📋 当前可用的 {len(available_satellites)} 个卫星智能体:")
                     for i, sat in enumerate(available_satellites):
@@ -494,74 +681,44 @@ transfer_to_agent(agent_name='{target_satellite_id}')
                 else:
                     logger.error("📋 当前没有可用的卫星智能体（sub_agents为空）")
 
-                return error_msg
+                return False, error_msg
 
             # 2. 直接调用卫星智能体的任务处理方法
             if hasattr(target_satellite, 'handle_transfer_task'):
                 # 如果卫星已经增强支持transfer
                 result = await target_satellite.handle_transfer_task(task_info)
                 logger.info(f"✅ 直接委托成功: {target_satellite.satellite_id}")
-                return f"✅ 任务已直接委托给卫星 {target_satellite.satellite_id}"
+                return True, f"✅ 任务已直接委托给卫星 {target_satellite.satellite_id}"
             else:
                 # 使用传统的任务管理器
                 if hasattr(target_satellite, 'task_manager'):
                     task_manager = target_satellite.task_manager
                     task_id = task_info.get('task_id')
 
-                    # 创建TaskInfo对象（与现有格式兼容）
-                    from .satellite_agent import TaskInfo
-                    from datetime import datetime
-
                     # 从metadata中提取时间信息
                     metadata = task_info.get('metadata', {})
                     start_time = datetime.now()
-                    end_time = datetime.now() + timedelta(hours=1)  # 默认1小时任务窗口
+                    end_time = start_time + timedelta(hours=1)  # 默认1小时任务窗口
 
-                    # 如果是元任务集，提取时间窗口
+                    # 如果是元任务集，提取时间窗口（fromisoformat可直接解析'Z'后缀）
                     if 'meta_task_message' in metadata:
                         meta_task_message = metadata['meta_task_message']
                         if 'time_window' in meta_task_message:
                             try:
-                                start_time = datetime.fromisoformat(meta_task_message['time_window']['start'].replace('Z', '+00:00'))
-                                end_time = datetime.fromisoformat(meta_task_message['time_window']['end'].replace('Z', '+00:00'))
-                            except:
+                                time_window = meta_task_message['time_window']
+                                start_time, end_time = (
+                                    datetime.fromisoformat(time_window['start']),
+                                    datetime.fromisoformat(time_window['end'])
+                                )
+                            except (KeyError, TypeError, ValueError):
                                 pass  # 使用默认时间
 
                     # 🔧 修复：从导弹目标名称中提取主要目标ID
-                    target_id = 'unknown'
-                    missile_target_names = []
-
-                    # 优先从metadata中获取导弹目标名称
-                    if 'missile_target_names' in metadata:
-                        missile_target_names = metadata['missile_target_names']
-                        if missile_target_names and len(missile_target_names) > 0:
-                            target_id = missile_target_names[0]  # 使用第一个导弹作为主要目标
-                    elif 'missile_list' in metadata:
-                        # 兼容旧格式
-                        missile_list = metadata['missile_list']
-                        if missile_list and len(missile_list) > 0:
-                            if isinstance(missile_list[0], dict):
-                                target_id = missile_list[0].get('missile_id', 'unknown')
-                                missile_target_names = [m.get('missile_id', f'missile_{i}') for i, m in enumerate(missile_list)]
-                            else:
-                                target_id = missile_list[0]
-                                missile_target_names = missile_list
-                    elif 'meta_task_message' in metadata:
-                        # 从元任务消息中提取
-                        meta_task_message = metadata['meta_task_message']
-                        if 'missile_target_names' in meta_task_message:
-                            missile_target_names = meta_task_message['missile_target_names']
-                            if missile_target_names and len(missile_target_names) > 0:
-                                target_id = missile_target_names[0]
-                        elif 'missile_list' in meta_task_message:
-                            missile_list = meta_task_message['missile_list']
-                            if missile_list and len(missile_list) > 0:
-                                if isinstance(missile_list[0], dict):
-                                    target_id = missile_list[0].get('missile_id', 'unknown')
-                                    missile_target_names = [m.get('missile_id', f'missile_{i}') for i, m in enumerate(missile_list)]
-                                else:
-                                    target_id = missile_list[0]
-                                    missile_target_names = missile_list
+                    # 优先从metadata中获取，其次从元任务消息中提取
+                    extracted = _extract_missile_targets(metadata)
+                    if extracted is None and 'meta_task_message' in metadata:
+                        extracted = _extract_missile_targets(metadata['meta_task_message'])
+                    target_id, missile_target_names = extracted or ('unknown', [])
 
                     # 确保metadata中包含完整的导弹目标信息
                     if missile_target_names:
@@ -571,6 +728,7 @@ transfer_to_agent(agent_name='{target_satellite_id}')
 
                     logger.info(f"🎯 任务目标映射: {target_id} (来源: {missile_target_names})")
 
+                    # 创建TaskInfo对象（与现有格式兼容）
                     task_info_obj = TaskInfo(
                         task_id=task_id,
                         target_id=target_id,  # 使用提取的主要目标ID
@@ -587,23 +745,21 @@ transfer_to_agent(agent_name='{target_satellite_id}')
                         logger.info(f"✅ 任务已添加到卫星 {target_satellite.satellite_id} 的任务管理器")
 
                         # 将任务添加到待完成列表（保持兼容性）
-                        if hasattr(self, '_pending_tasks'):
-                            self._pending_tasks.add(task_id)
-                            logger.info(f"📋 任务 {task_id} 已添加到待完成列表")
+                        self._pending_tasks.add(task_id)
+                        logger.info(f"📋 任务 {task_id} 已添加到待完成列表")
 
-                        return f"✅ 任务已委托给卫星 {target_satellite.satellite_id}（传统方式）"
+                        return True, f"✅ 任务已委托给卫星 {target_satellite.satellite_id}（传统方式）"
                     else:
                         logger.error(f"❌ 任务添加失败: {target_satellite.satellite_id}")
-                        return f"❌ 任务委托失败: {target_satellite.satellite_id}"
+                        return False, f"❌ 任务委托失败: {target_satellite.satellite_id}"
                 else:
                     logger.error(f"❌ 卫星 {target_satellite.satellite_id} 没有任务管理器")
-                    return f"❌ 卫星 {target_satellite.satellite_id} 没有任务管理器"
+                    return False, f"❌ 卫星 {target_satellite.satellite_id} 没有任务管理器"
 
         except Exception as e:
             logger.error(f"❌ 直接委托任务失败: {e}")
-            import traceback
-            logger.debug(f"详细错误: {traceback.format_exc()}")
-            return f"❌ 直接委托任务失败: {e}"
+            logger.debug("详细错误", exc_info=True)
+            return False, f"❌ 直接委托任务失败: {e}"
 
     def _find_satellite_by_id(self, target_satellite_id: str) -> Optional[Any]:
         """
@@ -632,41 +788,49 @@ transfer_to_agent(agent_name='{target_satellite_id}')
             agent_name = satellite_mapping[target_satellite_id]
             logger.info(f"📋 根据配置映射: {target_satellite_id} -> {agent_name}")
 
-            # 4. 获取所有可用的卫星智能体
-            all_satellites = self._get_all_available_satellites()
-
-            logger.info(f"📡 总共搜索 {len(all_satellites)} 个卫星智能体")
-
-            # 5. 严格匹配：只匹配satellite_id或name完全相等的
-            for satellite in all_satellites:
-                sat_info = self._get_satellite_debug_info(satellite)
-                logger.debug(f"   检查卫星: {sat_info}")
-
-                # 严格匹配逻辑
-                if self._is_exact_satellite_match(satellite, target_satellite_id, agent_name):
-                    logger.info(f"✅ 找到严格匹配的卫星智能体: {sat_info}")
-                    return satellite
+            # 4. 严格匹配：通过satellite_id/name索引查找，多个候选时取收集顺序中靠前的
+            satellite_index = self._get_satellite_index()
+            matches = [match for match in (satellite_index.get(target_satellite_id), satellite_index.get(agent_name)) if match]
+            if matches:
+                satellite = min(matches, key=lambda match: match[0])[1]
+                logger.info(f"✅ 找到严格匹配的卫星智能体: {self._get_satellite_debug_info(satellite)}")
+                return satellite
 
             # 如果没有找到，记录详细信息
-            logger.error(f"❌ 未找到卫星智能体 '{target_satellite_id}' (映射到 '{agent_name}')")
-            logger.error("📋 可用的卫星智能体:")
-            for satellite in all_satellites:
-                sat_info = self._get_satellite_debug_info(satellite)
-                logger.error(f"   - {sat_info}")
+            if logger.isEnabledFor(logging.ERROR):
+                all_satellites = self._get_all_available_satellites()
+                logger.error(f"❌ 未找到卫星智能体 '{target_satellite_id}' (映射到 '{agent_name}')")
+                logger.error("📋 可用的卫星智能体:")
+                for satellite in all_satellites:
+                    sat_info = self._get_satellite_debug_info(satellite)
+                    logger.error(f"   - {sat_info}")
 
             return None
 
         except Exception as e:
             logger.error(f"❌ 查找卫星智能体失败: {e}")
-            import traceback
-            logger.debug(f"详细错误: {traceback.format_exc()}")
+            logger.debug("详细错误", exc_info=True)
             return None
 
     def _get_satellite_naming_mapping(self) -> Dict[str, str]:
-        """从配置文件获取卫星命名映射"""
+        """从配置文件获取卫星命名映射（首次获取后缓存）"""
+        if self._satellite_mapping_cache is not None:
+            return self._satellite_mapping_cache
+
+        satellite_mapping = self._load_satellite_naming_mapping()
+        if satellite_mapping:
+            object.__setattr__(self, '_satellite_mapping_cache', satellite_mapping)
+        return satellite_mapping
+
+    def invalidate_satellite_mapping_cache(self):
+        """使卫星命名映射缓存失效（配置重新加载后调用）"""
+        object.__setattr__(self, '_satellite_mapping_cache', None)
+
+    def _load_satellite_naming_mapping(self) -> Dict[str, str]:
+        """从配置文件读取卫星命名映射"""
         try:
             # 从配置管理器获取卫星映射
-            if hasattr(self, '_config_manager') and self._config_manager:
+            if self._config_manager:
                 # 使用config属性而不是get_config方法
                 config = self._config_manager.config
                 constellation_config = config.get('constellation', {})
@@ -698,49 +862,65 @@ transfer_to_agent(agent_name='{target_satellite_id}')
             return {}
 
     def _get_all_available_satellites(self) -> List[Any]:
-        """获取所有可用的卫星智能体"""
-        all_satellites = []
+        """
+        获取所有可用的卫星智能体
+
+        按对象身份去重；来源未变化时复用上次结果。
+        缓存键包含各来源中智能体的对象身份，同一ID下替换智能体（如重新注册）也会重新收集
+        """
+        sub_agents = self.sub_agents
+        system_agents = {}
+        if self._multi_agent_system:
+            system_agents = getattr(self._multi_agent_system, '_satellite_agents', None) or {}
+        own_agents = self._satellite_agents or {}
+
+        cache_key = (
+            self._satellites_version,
+            tuple(map(id, sub_agents)),
+            tuple(map(id, system_agents.values())),
+            tuple(map(id, own_agents.values())),
+        )
+        cached = self._all_satellites_cache
+        if cached is not None and cached[0] == cache_key:
+            return cached[1]
+
+        seen: Dict[int, Any] = {}
 
         # 1. 从sub_agents获取
-        sub_agents = getattr(self, 'sub_agents', [])
-        all_satellites.extend(sub_agents)
+        for agent in sub_agents:
+            seen.setdefault(id(agent), agent)
 
         # 2. 从多智能体系统获取
-        if hasattr(self, '_multi_agent_system') and self._multi_agent_system:
-            if hasattr(self._multi_agent_system, '_satellite_agents'):
-                for sat_id, agent in self._multi_agent_system._satellite_agents.items():
-                    if agent not in all_satellites:
-                        all_satellites.append(agent)
+        for agent in system_agents.values():
+            seen.setdefault(id(agent), agent)
 
         # 3. 从_satellite_agents获取
-        if hasattr(self, '_satellite_agents') and self._satellite_agents:
-            for sat_id, agent in self._satellite_agents.items():
-                if agent not in all_satellites:
-                    all_satellites.append(agent)
+        for agent in own_agents.values():
+            seen.setdefault(id(agent), agent)
 
+        all_satellites = list(seen.values())
+        object.__setattr__(self, '_all_satellites_cache', (cache_key, all_satellites))
         return all_satellites
 
-    def _is_exact_satellite_match(self, satellite, target_satellite_id: str, agent_name: str) -> bool:
+    def _get_satellite_index(self) -> Dict[str, Tuple[int, Any]]:
         """
-        严格的卫星匹配检查
-        只允许精确匹配，不使用模糊逻辑
+        获取satellite_id/name到卫星智能体的索引
+
+        索引随_get_all_available_satellites的结果一同失效，值为(收集顺序位置, 卫星智能体)
         """
-        try:
-            # 1. 精确匹配satellite_id
-            if hasattr(satellite, 'satellite_id'):
-                if satellite.satellite_id == target_satellite_id or satellite.satellite_id == agent_name:
-                    return True
+        all_satellites = self._get_all_available_satellites()
+        cached = self._satellite_index_cache
+        if cached is not None and cached[0] is all_satellites:
+            return cached[1]
 
-            # 2. 精确匹配name
-            if hasattr(satellite, 'name'):
-                if satellite.name == target_satellite_id or satellite.name == agent_name:
-                    return True
+        satellite_index: Dict[str, Tuple[int, Any]] = {}
+        for position, satellite in enumerate(all_satellites):
+            for key in (getattr(satellite, 'satellite_id', None), getattr(satellite, 'name', None)):
+                if key:
+                    satellite_index.setdefault(key, (position, satellite))
 
-            return False
-
-        except Exception as e:
-            logger.debug(f"严格匹配检查失败: {e}")
-            return False
+        object.__setattr__(self, '_satellite_index_cache', (all_satellites, satellite_index))
+        return satellite_index
 
     def validate_satellite_naming_consistency(self) -> bool:
         """
@@ -764,10 +944,13 @@ transfer_to_agent(agent_name='{target_satellite_id}')
 
             # 4. 检查一致性
             consistency_issues = []
+            expected_set = set(expected_satellites)
+            stk_set = set(actual_stk_satellites)
+            agent_set = set(actual_agent_names)
 
             # 检查STK与配置的一致性
-            missing_in_stk = set(expected_satellites) - set(actual_stk_satellites)
-            extra_in_stk = set(actual_stk_satellites) - set(expected_satellites)
+            missing_in_stk = expected_set - stk_set
+            extra_in_stk = stk_set - expected_set
 
             if missing_in_stk:
                 consistency_issues.append(f"STK场景中缺少卫星: {missing_in_stk}")
@@ -775,8 +958,8 @@ transfer_to_agent(agent_name='{target_satellite_id}')
                 consistency_issues.append(f"STK场景中多余卫星: {extra_in_stk}")
 
             # 检查智能体与配置的一致性
-            missing_agents = set(expected_satellites) - set(actual_agent_names)
-            extra_agents = set(actual_agent_names) - set(expected_satellites)
+            missing_agents = expected_set - agent_set
+            extra_agents = agent_set - expected_set
 
             if missing_agents:
                 consistency_issues.append(f"智能体系统中缺少智能体: {missing_agents}")
@@ -801,18 +984,27 @@ transfer_to_agent(agent_name='{target_satellite_id}')
         """从配置文件获取预期的卫星名称"""
         try:
             satellite_mapping = self._get_satellite_naming_mapping()
-            return list(satellite_mapping.keys())
+            cached = self._expected_names_cache
+            if cached is not None and cached[0] is satellite_mapping:
+                return cached[1]
+
+            # 驻留名称字符串，使一致性检查中的集合比较可走指针相等的快速路径
+            expected_names = [sys.intern(name) for name in satellite_mapping]
+            object.__setattr__(self, '_expected_names_cache', (satellite_mapping, expected_names))
+            return expected_names
         except Exception as e:
             logger.error(f"❌ 获取配置文件卫星名称失败: {e}")
             return []
 
     def _get_actual_stk_satellite_names(self) -> List[str]:
         """从STK场景获取实际的卫星名称"""
-        try:
-            if hasattr(self, '_stk_manager') and self._stk_manager:
-                satellites = self._stk_manager.get_objects("Satellite")
-                return [sat.split('/')[-1] for sat in satellites]
+        stk_manager = getattr(self, '_stk_manager', None)
+        if not stk_manager:
             return []
+
+        try:
+            satellites = stk_manager.get_objects("Satellite")
+            return [sys.intern(sat.rsplit('/', 1)[-1]) for sat in satellites]
         except Exception as e:
             logger.error(f"❌ 获取STK卫星名称失败: {e}")
             return []
@@ -821,15 +1013,14 @@ transfer_to_agent(agent_name='{target_satellite_id}')
         """从智能体系统获取实际的智能体名称"""
         try:
             all_satellites = self._get_all_available_satellites()
-            agent_names = []
+            agent_names = {}  # 以dict作有序集合去重
 
             for satellite in all_satellites:
-                if hasattr(satellite, 'satellite_id'):
-                    agent_names.append(satellite.satellite_id)
-                elif hasattr(satellite, 'name'):
-                    agent_names.append(satellite.name)
+                sid = getattr(satellite, 'satellite_id', None) or getattr(satellite, 'name', None)
+                if sid:
+                    agent_names[sys.intern(sid)] = None
 
-            return list(set(agent_names))  # 去重
+            return list(agent_names)
         except Exception as e:
             logger.error(f"❌ 获取智能体名称失败: {e}")
             return []
@@ -837,18 +1028,20 @@ transfer_to_agent(agent_name='{target_satellite_id}')
     def _get_satellite_debug_info(self, satellite) -> str:
         """获取卫星调试信息"""
         try:
-            info_parts = []
-
-            # 名称
-            if hasattr(satellite, 'name'):
-                info_parts.append(f"name='{satellite.name}'")
+            name = getattr(satellite, 'name', None)
+            satellite_id = getattr(satellite, 'satellite_id', None)
+            type_name = _type_name(satellite)
 
-            # 卫星ID
-            if hasattr(satellite, 'satellite_id'):
-                info_parts.append(f"satellite_id='{satellite.satellite_id}'")
+            # 常见情况：名称与卫星ID均存在，直接格式化
+            if name is not None and satellite_id is not None:
+                return f"Satellite(name='{name}', satellite_id='{satellite_id}', type={type_name})"
 
-            # 类型
-            info_parts.append(f"type={type(satellite).__name__}")
+            info_parts = []
+            if name is not None:
+                info_parts.append(f"name='{name}'")
+            if satellite_id is not None:
+                info_parts.append(f"satellite_id='{satellite_id}'")
+            info_parts.append(f"type={type_name}")
 
             return f"Satellite({', '.join(info_parts)})"
 
@@ -866,18 +1059,12 @@ transfer_to_agent(agent_name='{target_satellite_id}')
             available_satellites = []
 
             # 从多智能体系统获取所有卫星智能体
-            if hasattr(self, '_multi_agent_system') and self._multi_agent_system:
+            if self._multi_agent_system:
                 satellite_agents = self._multi_agent_system.get_all_satellite_agents()
-
-                for satellite_id, satellite_agent in satellite_agents.items():
-                    satellite_info = {
-                        'id': satellite_id,
-                        'name': getattr(satellite_agent, 'name', satellite_id),
-                        'satellite_id': getattr(satellite_agent, 'satellite_id', satellite_id),
-                        'available': True,
-                        'agent_type': type(satellite_agent).__name__
-                    }
-                    available_satellites.append(satellite_info)
+                available_satellites = [
+                    _satellite_discussion_info(satellite_id, satellite_agent)
+                    for satellite_id, satellite_agent in satellite_agents.items()
+                ]
 
                 logger.info(f"📡 获取到 {len(available_satellites)} 个可用卫星智能体信息")
                 for sat_info in available_satellites:
@@ -902,30 +1089,30 @@ transfer_to_agent(agent_name='{target_satellite_id}')
         """
         try:
             # 设置session.state引用
-            if ctx and hasattr(ctx, 'session') and hasattr(ctx.session, 'state'):
-                self.set_session_state(ctx.session.state)
+            state = getattr(getattr(ctx, 'session', None), 'state', None)
+            if state is not None:
+                self.set_session_state(state)
+            else:
+                state = self._session_state
 
             # 如果启用了transfer模式，确保已初始化
             if self._transfer_enabled:
                 logger.info("🚀 运行ADK transfer优化的仿真调度")
 
                 # 初始化session.state结构
-                if hasattr(self, '_session_state') and self._session_state is not None:
-                    if 'task_results' not in self._session_state:
-                        self._session_state['task_results'] = {}
-                    if 'planning_trigger' not in self._session_state:
-                        self._session_state['planning_trigger'] = False
-                    if 'pending_delegations' not in self._session_state:
-                        self._session_state['pending_delegations'] = {}
+                if state is not None:
+                    state.setdefault('task_results', {})
+                    state.setdefault('planning_trigger', False)
+                    state.setdefault('pending_delegations', {})
 
                 yield Event(
                     author=self.name,
-                    content=types.Content(parts=[types.Part(text="🚀 启动ADK transfer优化的仿真调度智能体")])
+                    content=_STATIC_CONTENT["🚀 启动ADK transfer优化的仿真调度智能体"]
                 )
             else:
                 yield Event(
                     author=self.name,
-                    content=types.Content(parts=[types.Part(text="🔄 使用传统模式运行仿真调度智能体")])
+                    content=_STATIC_CONTENT["🔄 使用传统模式运行仿真调度智能体"]
                 )
 
             # 调用父类的运行逻辑
@@ -948,6 +1135,12 @@ class SatelliteAgentTransferExtension:
     这个扩展不修改SatelliteAgent的核心代码，而是通过组合模式添加transfer功能
     """
 
+    @staticmethod
+    def _get_parent_scheduler(satellite: SatelliteAgent) -> Optional[ADKTransferIntegratedScheduler]:
+        """获取卫星智能体所属的调度器（调度器已被回收时返回None）"""
+        scheduler_ref = getattr(satellite, '_parent_scheduler_ref', None)
+        return scheduler_ref() if scheduler_ref is not None else None
+
     @staticmethod
     async def enhance_satellite_for_transfer(satellite: SatelliteAgent) -> bool:
         """
@@ -962,31 +1155,29 @@ class SatelliteAgentTransferExtension:
         try:
             logger.info(f"🔧 为卫星 {satellite.satellite_id} 添加ADK transfer支持")
 
-            # 1. 添加transfer相关属性
-            object.__setattr__(satellite, '_transfer_enabled', True)
-            object.__setattr__(satellite, '_transfer_task_queue', [])
-            object.__setattr__(satellite, '_transfer_results', {})
-
-            # 2. 扩展_run_async_impl方法以支持transfer
+            # 1. 扩展_run_async_impl方法以支持transfer（需在替换前取得原方法）
             original_run_method = satellite._run_async_impl
-            enhanced_run_method = SatelliteAgentTransferExtension._create_enhanced_run_method(
-                satellite, original_run_method
-            )
-            object.__setattr__(satellite, '_run_async_impl', enhanced_run_method)
 
-            # 3. 添加transfer任务处理方法
-            object.__setattr__(
-                satellite,
-                'handle_transfer_task',
-                SatelliteAgentTransferExtension._create_transfer_handler(satellite)
-            )
+            updates = {
+                # 2. transfer相关属性
+                '_transfer_enabled': True,
+                '_transfer_task_queue': [],
+                '_transfer_results': {},
+                '_run_async_impl': SatelliteAgentTransferExtension._create_enhanced_run_method(
+                    satellite, original_run_method
+                ),
+                # 3. transfer任务处理方法
+                'handle_transfer_task': SatelliteAgentTransferExtension._create_transfer_handler(satellite),
+                # 4. 结果回传方法
+                'report_transfer_result': SatelliteAgentTransferExtension._create_result_reporter(satellite),
+            }
 
-            # 4. 添加结果回传方法
-            object.__setattr__(
-                satellite,
-                'report_transfer_result',
-                SatelliteAgentTransferExtension._create_result_reporter(satellite)
-            )
+            # 一次性写入实例__dict__；没有__dict__（__slots__）时逐个设置
+            try:
+                satellite.__dict__.update(updates)
+            except AttributeError:
+                for attr_name, value in updates.items():
+                    object.__setattr__(satellite, attr_name, value)
 
             logger.info(f"✅ 卫星 {satellite.satellite_id} ADK transfer支持添加完成")
             return True
@@ -996,26 +1187,48 @@ class SatelliteAgentTransferExtension:
             return False
 
     @staticmethod
-    def _create_enhanced_run_method(satellite: SatelliteAgent, original_method):
-        """创建增强的运行方法，支持transfer任务处理"""
+    def _create_enhanced_run_method(
+        satellite: SatelliteAgent,
+        original_method,
+        _Event=Event,
+        _Content=types.Content,
+        _Part=types.Part,
+        _EventActions=EventActions,
+        _logger=logger
+    ):
+        """创建增强的运行方法，支持transfer任务处理（常用全局名以默认参数预绑定到闭包）"""
+        handle_transfer_tasks = SatelliteAgentTransferExtension._handle_transfer_tasks
+
         async def enhanced_run_async_impl(ctx: InvocationContext) -> AsyncGenerator[Event, None]:
+            sat_id = satellite.satellite_id
             try:
-                logger.info(f"🛰️ 卫星 {satellite.satellite_id} 开始运行（ADK transfer模式）")
+                _logger.info(f"🛰️ 卫星 {sat_id} 开始运行（ADK transfer模式）")
 
                 # 1. 检查是否有transfer委托的任务
-                pending_delegations = ctx.session.state.get('pending_delegations', {})
-                transfer_tasks = []
-
-                for delegation_id, delegation_info in pending_delegations.items():
-                    target_satellite_id = delegation_info.get('target_satellite_id')
-                    if target_satellite_id == satellite.satellite_id or target_satellite_id is None:
-                        transfer_tasks.append((delegation_id, delegation_info))
+                state = ctx.session.state
+                pending_delegations = state.get('pending_delegations', {})
+                delegations_by_target = state.get('delegations_by_target')
+
+                if delegations_by_target is None:
+                    # 没有目标索引（旧格式），扫描全部待处理委托
+                    task_ids = [
+                        delegation_id
+                        for delegation_id, delegation_info in pending_delegations.items()
+                        if delegation_info.get('target_satellite_id') in (sat_id, None)
+                    ]
+                else:
+                    # 已完成的委托在处理时从索引中移除，这里只读取本卫星及未指定目标的委托
+                    task_ids = [
+                        delegation_id
+                        for target_key in (sat_id, _UNTARGETED_DELEGATION_KEY)
+                        for delegation_id in delegations_by_target.get(target_key, ())
+                        if delegation_id in pending_delegations
+                    ]
+                task_infos = [pending_delegations[d] for d in task_ids]
 
                 # 2. 处理transfer任务
-                if transfer_tasks:
-                    async for event in SatelliteAgentTransferExtension._handle_transfer_tasks(
-                        satellite, ctx, transfer_tasks
-                    ):
+                if task_ids:
+                    async for event in handle_transfer_tasks(satellite, ctx, task_ids, task_infos):
                         yield event
                 else:
                     # 3. 执行原有的运行逻辑
@@ -1023,11 +1236,11 @@ class SatelliteAgentTransferExtension:
                         yield event
 
             except Exception as e:
-                logger.error(f"❌ 卫星 {satellite.satellite_id} 增强运行失败: {e}")
-                yield Event(
+                _logger.error(f"❌ 卫星 {sat_id} 增强运行失败: {e}")
+                yield _Event(
                     author=satellite.name,
-                    content=types.Content(parts=[types.Part(text=f"❌ 运行失败: {e}")]),
-                    actions=EventActions(escalate=True)
+                    content=_Content(parts=[_Part(text=f"❌ 运行失败: {e}")]),
+                    actions=_EventActions(escalate=True)
                 )
 
         return enhanced_run_async_impl
@@ -1036,18 +1249,42 @@ class SatelliteAgentTransferExtension:
     async def _handle_transfer_tasks(
         satellite: SatelliteAgent,
         ctx: InvocationContext,
-        transfer_tasks: List[tuple]
+        delegation_ids: List[str],
+        delegation_infos: List[Dict[str, Any]],
+        batch_events: Optional[bool] = None
     ) -> AsyncGenerator[Event, None]:
-        """处理transfer委托的任务"""
+        """
+        处理transfer委托的任务
+
+        Args:
+            delegation_ids: 委托ID列表
+            delegation_infos: 与delegation_ids一一对应的委托信息列表
+            batch_events: 是否将各任务的接收/完成事件合并为一条汇总事件；
+                None时仅在DEBUG日志级别下逐任务产生事件
+        """
+        sat_name = satellite.name
+        if batch_events is None:
+            batch_events = not logger.isEnabledFor(logging.DEBUG)
         try:
-            for delegation_id, delegation_info in transfer_tasks:
+            state = ctx.session.state
+            task_results = state.setdefault('task_results', {})
+            pending = state.get('pending_delegations')
+            delegations_by_target = state.get('delegations_by_target')
+            parent_scheduler = SatelliteAgentTransferExtension._get_parent_scheduler(satellite)
+            received_ids = []
+            completed_ids = []
+
+            for delegation_id, delegation_info in zip(delegation_ids, delegation_infos):
                 task_info = delegation_info.get('task_info', {})
                 task_id = task_info.get('task_id')
 
-                yield Event(
-                    author=satellite.name,
-                    content=types.Content(parts=[types.Part(text=f"📋 接收transfer任务: {task_id}")])
-                )
+                if batch_events:
+                    received_ids.append(task_id)
+                else:
+                    yield Event(
+                        author=sat_name,
+                        content=types.Content(parts=[types.Part(text=f"📋 接收transfer任务: {task_id}")])
+                    )
 
                 # 使用现有的任务处理逻辑
                 task_result = await SatelliteAgentTransferExtension._execute_transfer_task(
@@ -1055,33 +1292,54 @@ class SatelliteAgentTransferExtension:
                 )
 
                 # 保存结果到session.state
-                if 'task_results' not in ctx.session.state:
-                    ctx.session.state['task_results'] = {}
-
-                ctx.session.state['task_results'][task_id] = task_result
-
-                # 清除已处理的委托
-                if 'pending_delegations' in ctx.session.state:
-                    ctx.session.state['pending_delegations'].pop(delegation_id, None)
+                task_results[task_id] = task_result
+
+                # 通知调度器任务已完成
+                if parent_scheduler is not None:
+                    parent_scheduler.notify_transfer_task_completed(task_id)
+
+                # 清除已处理的委托（待处理委托及目标索引）
+                if pending is not None:
+                    pending.pop(delegation_id, None)
+                if delegations_by_target is not None:
+                    target_key = delegation_info.get('target_satellite_id') or _UNTARGETED_DELEGATION_KEY
+                    target_ids = delegations_by_target.get(target_key)
+                    if target_ids and delegation_id in target_ids:
+                        target_ids.remove(delegation_id)
+                        if not target_ids:
+                            del delegations_by_target[target_key]
+
+                if batch_events:
+                    completed_ids.append(task_id)
+                else:
+                    yield Event(
+                        author=sat_name,
+                        content=types.Content(parts=[types.Part(text=f"✅ Transfer任务完成: {task_id}")])
+                    )
 
+            if received_ids:
                 yield Event(
-                    author=satellite.name,
-                    content=types.Content(parts=[types.Part(text=f"✅ Transfer任务完成: {task_id}")])
+                    author=sat_name,
+                    content=types.Content(parts=[types.Part(
+                        text=f"📋 接收transfer任务: {received_ids}\n✅ Transfer任务完成: {completed_ids}"
+                    )])
                 )
 
             # 触发下一轮规划
-            ctx.session.state['planning_trigger'] = True
+            state['planning_trigger'] = True
+            if parent_scheduler is not None:
+                parent_scheduler.notify_planning_trigger()
 
             yield Event(
-                author=satellite.name,
-                content=types.Content(parts=[types.Part(text="🚀 所有transfer任务完成，触发下一轮规划")]),
+                author=sat_name,
+                content=_STATIC_CONTENT["🚀 所有transfer任务完成，触发下一轮规划"],
                 actions=EventActions(escalate=True)
             )
 
         except Exception as e:
             logger.error(f"❌ 处理transfer任务失败: {e}")
             yield Event(
-                author=satellite.name,
+                author=sat_name,
                 content=types.Content(parts=[types.Part(text=f"❌ Transfer任务处理失败: {e}")])
             )
 
@@ -1092,39 +1350,24 @@ class SatelliteAgentTransferExtension:
         task_info: Dict[str, Any]
     ) -> Dict[str, Any]:
         """执行transfer委托的任务，保持所有具身特性"""
+        sat_id = satellite.satellite_id
+        # 每个任务只读取一次时钟，TaskInfo与结果记录共用
+        now = datetime.now()
+        now_iso = now.isoformat()
         try:
             task_id = task_info.get('task_id')
             task_type = task_info.get('task_type', 'unknown')
 
-            logger.info(f"🔄 卫星 {satellite.satellite_id} 执行transfer任务: {task_id}")
-
-            # 创建TaskInfo对象（使用现有的数据结构）
-            from .satellite_agent import TaskInfo
+            logger.info(f"🔄 卫星 {sat_id} 执行transfer任务: {task_id}")
 
             # 🔧 修复：从导弹目标名称中提取主要目标ID
-            target_id = 'unknown'
-            missile_target_names = []
+            # 优先从task_info直接获取导弹目标名称，其次从metadata中获取
             metadata = task_info.get('metadata', {})
-
-            # 优先从task_info直接获取导弹目标名称
-            if 'missile_target_names' in task_info:
-                missile_target_names = task_info['missile_target_names']
-                if missile_target_names and len(missile_target_names) > 0:
-                    target_id = missile_target_names[0]
-            elif 'missile_target_names' in metadata:
-                missile_target_names = metadata['missile_target_names']
-                if missile_target_names and len(missile_target_names) > 0:
-                    target_id = missile_target_names[0]
-            elif 'missile_list' in metadata:
-                # 兼容旧格式
-                missile_list = metadata['missile_list']
-                if missile_list and len(missile_list) > 0:
-                    if isinstance(missile_list[0], dict):
-                        target_id = missile_list[0].get('missile_id', 'unknown')
-                        missile_target_names = [m.get('missile_id', f'missile_{i}') for i, m in enumerate(missile_list)]
-                    else:
-                        target_id = missile_list[0]
-                        missile_target_names = missile_list
+            target_id, missile_target_names = (
+                _extract_missile_targets(task_info, include_missile_list=False)
+                or _extract_missile_targets(metadata)
+                or ('unknown', [])
+            )
 
             # 确保metadata中包含完整的导弹目标信息
             if missile_target_names:
@@ -1134,11 +1377,12 @@ class SatelliteAgentTransferExtension:
 
             logger.info(f"🎯 Transfer任务目标映射: {target_id} (来源: {missile_target_names})")
 
+            # 创建TaskInfo对象（使用现有的数据结构）
             task = TaskInfo(
                 task_id=task_id,
                 target_id=target_id,  # 使用提取的主要目标ID
-                start_time=datetime.now(),
-                end_time=datetime.now(),
+                start_time=now,
+                end_time=now,
                 priority=task_info.get('priority', 0.5),
                 status='executing',
                 metadata=metadata
@@ -1151,12 +1395,12 @@ class SatelliteAgentTransferExtension:
 
                 result = {
                     "task_id": task_id,
-                    "satellite_id": satellite.satellite_id,
-                    "execution_time": datetime.now().isoformat(),
+                    "satellite_id": sat_id,
+                    "execution_time": now_iso,
                     "result_type": "coordination_leader",
                     "result_data": {
                         "success": True,
-                        "details": f"卫星 {satellite.satellite_id} 作为组长创建讨论组",
+                        "details": f"卫星 {sat_id} 作为组长创建讨论组",
                         "discussion_group_created": True,
                         "orbital_parameters": getattr(satellite, 'orbital_parameters', {}),
                         "payload_config": getattr(satellite, 'payload_config', {})
@@ -1176,12 +1420,12 @@ class SatelliteAgentTransferExtension:
 
                 result = {
                     "task_id": task_id,
-                    "satellite_id": satellite.satellite_id,
-                    "execution_time": datetime.now().isoformat(),
+                    "satellite_id": sat_id,
+                    "execution_time": now_iso,
                     "result_type": "individual",
                     "result_data": {
                         "success": True,
-                        "details": f"卫星 {satellite.satellite_id} 完成个体任务",
+                        "details": f"卫星 {sat_id} 完成个体任务",
                         "visibility_result": visibility_result,
                         "orbital_parameters": getattr(satellite, 'orbital_parameters', {}),
                         "payload_config": getattr(satellite, 'payload_config', {}),
@@ -1189,15 +1433,15 @@ class SatelliteAgentTransferExtension:
                     }
                 }
 
-            logger.info(f"✅ 卫星 {satellite.satellite_id} transfer任务执行完成: {task_id}")
+            logger.info(f"✅ 卫星 {sat_id} transfer任务执行完成: {task_id}")
             return result
 
         except Exception as e:
-            logger.error(f"❌ 卫星 {satellite.satellite_id} transfer任务执行失败: {e}")
+            logger.error(f"❌ 卫星 {sat_id} transfer任务执行失败: {e}")
             return {
                 "task_id": task_info.get('task_id'),
-                "satellite_id": satellite.satellite_id,
-                "execution_time": datetime.now().isoformat(),
+                "satellite_id": sat_id,
+                "execution_time": now_iso,
                 "result_type": "error",
                 "result_data": {
                     "success": False,
@@ -1209,20 +1453,20 @@ class SatelliteAgentTransferExtension:
     @staticmethod
     def _create_transfer_handler(satellite: SatelliteAgent):
         """创建transfer任务处理器"""
+        execute_transfer_task = SatelliteAgentTransferExtension._execute_transfer_task
+
         async def handle_transfer_task(task_info: Dict[str, Any]) -> Dict[str, Any]:
             """处理transfer委托的任务"""
-            return await SatelliteAgentTransferExtension._execute_transfer_task(
-                satellite, None, task_info
-            )
+            return await execute_transfer_task(satellite, None, task_info)
 
         return handle_transfer_task
 
     @staticmethod
-    def _create_result_reporter(satellite: SatelliteAgent):
+    def _create_result_reporter(satellite: SatelliteAgent, _logger=logger):
         """创建结果报告器"""
         def report_transfer_result(task_id: str, result: Dict[str, Any]):
             """报告transfer任务结果"""
-            logger.info(f"📊 卫星 {satellite.satellite_id} 报告任务结果: {task_id}")
+            _logger.info(f"📊 卫星 {satellite.satellite_id} 报告任务结果: {task_id}")
             # 这里可以添加结果报告逻辑
             return True
 
@@ -4,9 +4,11 @@
 """
 
 import asyncio
+import collections
 import logging
+from dataclasses import asdict, dataclass
 from datetime import datetime
-from typing import Dict, List, Any, Optional, AsyncGenerator
+from typing import Dict, List, Any, Optional, AsyncGenerator, Tuple
 from uuid import uuid4
 
 from google.adk.agents import LlmAgent, BaseAgent, SequentialAgent
@@ -16,6 +18,99 @@ from google.genai import types
 
 logger = logging.getLogger(__name__)
 
+# 调度器指令模板（{agents_list}为卫星智能体描述列表）
+_SCHEDULER_INSTRUCTION_TMPL = """
+你是仿真调度智能体，负责协调卫星任务执行和滚动规划。
+
+可用的卫星智能体：
+{agents_list}
+
+你的主要职责：
+1. 接收元任务请求，分析任务需求
+2. 使用transfer_to_agent将任务委托给合适的卫星智能体
+3. 监控任务执行状态，收集结果
+4. 在任务完成后立即启动下一轮滚动规划
+
+使用transfer_to_agent的格式：
+- transfer_to_agent(agent_name='目标智能体名称')
+
+任务委托策略：
+- 对于单个目标任务：选择最近的卫星智能体
+- 对于多目标任务：选择覆盖范围最优的卫星智能体组合
+- 对于协同任务：委托给组长卫星智能体，由其创建讨论组
+
+将任务结果保存到session.state中，格式：
+- session.state['task_results'][task_id] = 任务结果
+- session.state['planning_trigger'] = True  # 触发下一轮规划
+"""
+
+# 任务委托提示模板（{tasks_text}为任务摘要列表）
+_DELEGATION_PROMPT_TMPL = """
+需要委托以下任务：
+{tasks_text}
+
+请分析每个任务的特点，选择最合适的卫星智能体，并使用transfer_to_agent进行委托。
+
+委托策略：
+1. 单目标任务 -> 选择最近的卫星智能体
+2. 多目标任务 -> 选择覆盖范围最优的卫星智能体
+3. 协同任务 -> 委托给组长卫星智能体
+
+请为每个任务调用：transfer_to_agent(agent_name='选定的卫星智能体名称')
+"""
+
+# 卫星智能体指令模板（{satellite_id}为卫星ID，结果格式中的花括号已转义）
+_SATELLITE_INSTRUCTION_TMPL = """
+你是卫星 {satellite_id} 智能体，负责执行委托的任务。
+
+当接收到任务委托时，你需要：
+1. 分析任务需求和约束条件
+2. 执行必要的计算（如可见性计算、轨道分析等）
+3. 如果是协同任务，创建讨论组与其他卫星协作
+4. 将执行结果保存到session.state中
+5. 设置规划触发器启动下一轮规划
+
+任务执行流程：
+1. 接收任务 -> 分析任务类型和需求
+2. 单独执行 -> 直接计算并返回结果
+3. 协同执行 -> 创建讨论组，协调其他卫星
+4. 结果保存 -> session.state['task_results'][task_id] = 结果
+5. 触发规划 -> session.state['planning_trigger'] = True
+
+结果格式：
+{{
+    "task_id": "任务ID",
+    "satellite_id": "{satellite_id}",
+    "execution_time": "执行时间",
+    "result_type": "single|collaborative",
+    "result_data": {{
+        "success": true/false,
+        "details": "详细结果",
+        "metrics": {{"gdop": 值, "coverage": 值}}
+    }},
+    "discussion_group_id": "讨论组ID（如果有）"
+}}
+"""
+
+
+@dataclass(slots=True, frozen=True)
+class MetaTask:
+    """元任务数据结构（写入session.state时转换为dict）"""
+    task_id: str
+    description: str
+    priority: float
+    target_count: int
+
+    @classmethod
+    def from_state(cls, task: Dict[str, Any]) -> "MetaTask":
+        """从session.state中的dict构建元任务，缺失字段取默认值，忽略多余字段"""
+        return cls(
+            task_id=task.get('task_id'),
+            description=task.get('description', ''),
+            priority=task.get('priority', 0.8),
+            target_count=task.get('target_count', 1),
+        )
+
 
 class ADKTransferOptimizedScheduler(LlmAgent):
     """
@@ -27,26 +122,47 @@ class ADKTransferOptimizedScheduler(LlmAgent):
     3. 支持任务完成后立即启动下一轮规划
     """
     
-    def __init__(self, satellite_agents: List[BaseAgent]):
+    def __init__(self, satellite_agents: List[BaseAgent], use_llm_delegation: bool = False):
         """
         初始化优化的调度智能体
         
         Args:
             satellite_agents: 卫星智能体列表，将作为sub_agents
+            use_llm_delegation: 是否由LLM生成transfer_to_agent调用委托任务；
+                默认由调度器按评分直接分派给卫星智能体
         """
+        # 卫星智能体名称与描述（并行元组，构建一次后复用）
+        agent_names = tuple(agent.name for agent in satellite_agents)
+        agent_descriptions = tuple(getattr(agent, 'description', '卫星智能体') for agent in satellite_agents)
+
         super().__init__(
             name="ADKTransferOptimizedScheduler",
             model="gemini-2.0-flash",
-            instruction=self._build_transfer_instruction(satellite_agents),
+            instruction=self._build_transfer_instruction(agent_names, agent_descriptions),
             description="基于ADK transfer_to_agent优化的仿真调度智能体",
             sub_agents=satellite_agents  # 设置为sub_agents，启用transfer_to_agent
         )
         
         # 使用object.__setattr__绕过Pydantic的字段验证
+        object.__setattr__(self, '_agent_names', agent_names)
+        object.__setattr__(self, '_agent_descriptions', agent_descriptions)
+
         # 任务状态管理
         object.__setattr__(self, '_active_tasks', {})
         object.__setattr__(self, '_completed_tasks', {})
         object.__setattr__(self, '_task_completion_callbacks', {})
+        # 本轮待完成任务ID及完成事件（卫星写入结果后通知，替代轮询）
+        object.__setattr__(self, '_pending_ids', set())
+        object.__setattr__(self, '_completion_event', asyncio.Event())
+
+        # 本轮执行失败（卫星未写入结果）的任务ID
+        object.__setattr__(self, '_failed_ids', set())
+
+        # 任务分派方式；直接分派时记录本轮的(卫星, 委托信息)及正在执行的卫星任务
+        object.__setattr__(self, '_use_llm_delegation', use_llm_delegation)
+        object.__setattr__(self, '_dispatch_assignments', [])
+        object.__setattr__(self, '_dispatch_tasks', set())
+        object.__setattr__(self, '_dispatched_directly', False)
 
         # 滚动规划状态
         object.__setattr__(self, '_planning_cycle', 0)
@@ -54,38 +170,12 @@ class ADKTransferOptimizedScheduler(LlmAgent):
         
         logger.info(f"✅ ADK Transfer优化调度器初始化完成，管理 {len(satellite_agents)} 个卫星智能体")
 
-    def _build_transfer_instruction(self, satellite_agents: List[BaseAgent]) -> str:
+    def _build_transfer_instruction(self, agent_names: Tuple[str, ...], agent_descriptions: Tuple[str, ...]) -> str:
         """构建支持transfer_to_agent的指令"""
-        agent_descriptions = []
-        for agent in satellite_agents:
-            agent_descriptions.append(f"- {agent.name}: {getattr(agent, 'description', '卫星智能体')}")
-        
-        agents_list = "\n".join(agent_descriptions)
-        
-        return f"""
-你是仿真调度智能体，负责协调卫星任务执行和滚动规划。
-
-可用的卫星智能体：
-{agents_list}
-
-你的主要职责：
-1. 接收元任务请求，分析任务需求
-2. 使用transfer_to_agent将任务委托给合适的卫星智能体
-3. 监控任务执行状态，收集结果
-4. 在任务完成后立即启动下一轮滚动规划
-
-使用transfer_to_agent的格式：
-- transfer_to_agent(agent_name='目标智能体名称')
-
-任务委托策略：
-- 对于单个目标任务：选择最近的卫星智能体
-- 对于多目标任务：选择覆盖范围最优的卫星智能体组合
-- 对于协同任务：委托给组长卫星智能体，由其创建讨论组
-
-将任务结果保存到session.state中，格式：
-- session.state['task_results'][task_id] = 任务结果
-- session.state['planning_trigger'] = True  # 触发下一轮规划
-"""
+        agents_list = "\n".join(
+            f"- {name}: {description}" for name, description in zip(agent_names, agent_descriptions)
+        )
+        return _SCHEDULER_INSTRUCTION_TMPL.format_map({'agents_list': agents_list})
 
     async def _run_async_impl(self, ctx: InvocationContext) -> AsyncGenerator[Event, None]:
         """
@@ -116,6 +206,15 @@ class ADKTransferOptimizedScheduler(LlmAgent):
 
     async def _rolling_planning_loop(self, ctx: InvocationContext) -> AsyncGenerator[Event, None]:
         """滚动规划循环，支持实时响应"""
+        try:
+            async for event in self._rolling_planning_cycles(ctx):
+                yield event
+        finally:
+            # 循环结束（包括被关闭或取消）时停止仍在执行的卫星任务
+            self._cancel_dispatch_tasks()
+
+    async def _rolling_planning_cycles(self, ctx: InvocationContext) -> AsyncGenerator[Event, None]:
+        """逐轮执行滚动规划"""
         while self._is_running:
             self._planning_cycle += 1
             
@@ -139,6 +238,11 @@ class ADKTransferOptimizedScheduler(LlmAgent):
                     author=self.name,
                     content=types.Content(parts=[types.Part(text=f"📡 任务委托完成: {delegation_results}")])
                 )
+
+                # 2.1 直接分派：由调度器执行各卫星的委托任务并转发其事件
+                if self._dispatched_directly:
+                    async for event in self._run_dispatched_satellites(ctx):
+                        yield event
                 
                 # 3. 等待任务完成（实时响应）
                 completion_results = await self._wait_for_task_completion(ctx)
@@ -164,22 +268,43 @@ class ADKTransferOptimizedScheduler(LlmAgent):
     async def _delegate_tasks_with_transfer(
         self, 
         ctx: InvocationContext, 
-        meta_tasks: List[Dict[str, Any]]
+        meta_tasks: List[MetaTask]
     ) -> str:
         """
-        使用ADK transfer_to_agent委托任务
-        
-        这个方法会触发LLM生成transfer_to_agent调用
+        委托任务给卫星智能体
+
+        默认按卫星负载直接分派（_assign_tasks），由滚动规划循环执行卫星任务，不经过LLM；
+        启用use_llm_delegation时触发LLM生成transfer_to_agent调用
         """
         try:
             # 准备任务委托信息
             delegation_info = {
-                'meta_tasks': meta_tasks,
                 'delegation_time': datetime.now().isoformat(),
                 'planning_cycle': self._planning_cycle
             }
             
+            # 登记本轮待完成任务，重置完成事件
+            self._pending_ids.clear()
+            self._pending_ids.update(task.task_id for task in meta_tasks)
+            self._failed_ids.clear()
+            self._completion_event.clear()
+
+            object.__setattr__(self, '_dispatched_directly', False)
+            object.__setattr__(self, '_dispatch_assignments', [])
+            if not self._use_llm_delegation:
+                assignments = self._assign_tasks(meta_tasks)
+                if assignments:
+                    object.__setattr__(self, '_dispatch_assignments', [
+                        (satellite, dict(delegation_info, meta_tasks=tasks))
+                        for satellite, tasks in assignments
+                    ])
+                    object.__setattr__(self, '_dispatched_directly', True)
+                    logger.info(f"📡 直接分派 {len(meta_tasks)} 个任务给 {len(assignments)} 个卫星智能体")
+                    return f"直接分派 {len(meta_tasks)} 个任务给 {len(assignments)} 个卫星智能体"
+                logger.warning("⚠️ 没有可直接分派的卫星智能体，回退到LLM委托")
+
             # 保存到状态中，供LLM读取
+            delegation_info['meta_tasks'] = [asdict(task) for task in meta_tasks]
             ctx.session.state['pending_delegation'] = delegation_info
             
             # 构建委托提示，让LLM决定如何使用transfer_to_agent
@@ -195,83 +320,158 @@ class ADKTransferOptimizedScheduler(LlmAgent):
             logger.error(f"❌ 任务委托失败: {e}")
             return f"❌ 任务委托失败: {e}"
 
-    def _build_delegation_prompt(self, meta_tasks: List[Dict[str, Any]]) -> str:
-        """构建任务委托提示"""
-        task_summaries = []
-        for i, task in enumerate(meta_tasks):
-            task_summaries.append(f"任务{i+1}: {task.get('description', '未知任务')}")
-        
-        tasks_text = "\n".join(task_summaries)
-        
-        return f"""
-需要委托以下任务：
-{tasks_text}
+    def _agent_load(self, agent: BaseAgent, assigned_targets: int = 0) -> float:
+        """
+        估算卫星智能体的负载（越小越空闲）
 
-请分析每个任务的特点，选择最合适的卫星智能体，并使用transfer_to_agent进行委托。
+        以本轮已分配的目标数为主，历史任务数仅用于负载相同时的区分
+        """
+        history = getattr(agent, '_task_history', None)
+        return assigned_targets + (len(history) if history is not None else 0) * 1e-3
 
-委托策略：
-1. 单目标任务 -> 选择最近的卫星智能体
-2. 多目标任务 -> 选择覆盖范围最优的卫星智能体
-3. 协同任务 -> 委托给组长卫星智能体
+    def _assign_tasks(self, meta_tasks: List[MetaTask]) -> List[Tuple["ADKTransferOptimizedSatellite", List[MetaTask]]]:
+        """
+        按负载均衡将元任务分配给卫星智能体
 
-请为每个任务调用：transfer_to_agent(agent_name='选定的卫星智能体名称')
-"""
+        高优先级任务先分配，每个任务交给当前负载最小的卫星；调度器没有轨道/覆盖信息，
+        因此不做最近卫星或覆盖范围的选择
+
+        Returns:
+            (卫星智能体, 分配的任务列表)；没有可分派的卫星时返回空列表
+        """
+        candidates = [agent for agent in self.sub_agents if isinstance(agent, ADKTransferOptimizedSatellite)]
+        if not candidates:
+            return []
+
+        assigned_targets = {agent.name: 0 for agent in candidates}
+        assignments: Dict[str, List[MetaTask]] = {}
+        for task in sorted(meta_tasks, key=lambda t: t.priority, reverse=True):
+            satellite = min(candidates, key=lambda agent: self._agent_load(agent, assigned_targets[agent.name]))
+            assigned_targets[satellite.name] += max(task.target_count, 1)
+            assignments.setdefault(satellite.name, []).append(task)
+
+        return [(agent, assignments[agent.name]) for agent in candidates if agent.name in assignments]
+
+    async def _run_dispatched_satellites(self, ctx: InvocationContext) -> AsyncGenerator[Event, None]:
+        """
+        并发执行本轮直接分派的卫星任务，按产生顺序转发各卫星的事件
+
+        卫星执行结束（包括异常或被取消）时仍未上报结果的任务按失败处理，
+        避免等待方空等到超时
+        """
+        assignments = self._dispatch_assignments
+        object.__setattr__(self, '_dispatch_assignments', [])
+        event_queue: asyncio.Queue = asyncio.Queue()
+
+        async def _pump(satellite: "ADKTransferOptimizedSatellite", delegation_info: Dict[str, Any]):
+            try:
+                satellite_ctx = ctx.model_copy(update={'agent': satellite})
+                async for event in satellite._execute_delegated_tasks(satellite_ctx, delegation_info):
+                    event_queue.put_nowait(event)
+            except Exception as e:
+                logger.error(f"❌ 卫星 {satellite.name} 执行分派任务失败: {e}")
+            finally:
+                for task in delegation_info['meta_tasks']:
+                    self.notify_task_failed(task.task_id)
+                event_queue.put_nowait(None)
+
+        pumps = []
+        for satellite, delegation_info in assignments:
+            pump = asyncio.create_task(_pump(satellite, delegation_info))
+            self._dispatch_tasks.add(pump)
+            pump.add_done_callback(self._dispatch_tasks.discard)
+            pumps.append(pump)
+
+        try:
+            remaining = len(pumps)
+            while remaining:
+                event = await event_queue.get()
+                if event is None:
+                    remaining -= 1
+                    continue
+                yield event
+        finally:
+            for pump in pumps:
+                if not pump.done():
+                    pump.cancel()
+
+    def _cancel_dispatch_tasks(self):
+        """取消仍在执行的直接分派卫星任务"""
+        for dispatch_task in list(self._dispatch_tasks):
+            dispatch_task.cancel()
+
+    def _build_delegation_prompt(self, meta_tasks: List[MetaTask]) -> str:
+        """构建任务委托提示"""
+        tasks_text = "\n".join([
+            f"任务{i+1}: {task.description or '未知任务'}"
+            for i, task in enumerate(meta_tasks)
+        ])
+        return _DELEGATION_PROMPT_TMPL.format_map({'tasks_text': tasks_text})
 
     async def _wait_for_task_completion(self, ctx: InvocationContext) -> str:
         """
         等待任务完成，支持实时响应
-        
-        通过监控session.state中的任务结果实现实时响应
+
+        卫星智能体写入任务结果或设置规划触发器时通知调度器，
+        此处等待完成事件而不轮询session.state
         """
         try:
-            start_time = datetime.now()
             max_wait_time = 300  # 5分钟最大等待时间
-            
-            while (datetime.now() - start_time).total_seconds() < max_wait_time:
-                # 检查是否有任务完成
-                task_results = ctx.session.state.get('task_results', {})
-                active_delegations = ctx.session.state.get('active_delegations', {})
-                
-                # 检查所有活跃委托是否完成
-                completed_count = 0
-                total_count = len(active_delegations)
-                
-                for delegation_id, delegation_info in active_delegations.items():
-                    if delegation_id in task_results:
-                        completed_count += 1
-                
-                if total_count > 0 and completed_count == total_count:
-                    logger.info(f"✅ 所有任务完成: {completed_count}/{total_count}")
-                    return f"所有任务完成: {completed_count}/{total_count}"
-                
-                # 检查是否有规划触发器
-                if ctx.session.state.get('planning_trigger', False):
-                    ctx.session.state['planning_trigger'] = False
-                    logger.info("🚀 检测到规划触发器，立即启动下一轮")
-                    return "检测到任务完成，触发下一轮规划"
-                
-                # 短暂等待
-                await asyncio.sleep(0.5)
-            
-            # 超时处理
-            logger.warning(f"⚠️ 任务等待超时，已等待 {max_wait_time} 秒")
-            return f"任务等待超时，部分任务可能仍在执行"
-            
+
+            try:
+                await asyncio.wait_for(self._completion_event.wait(), timeout=max_wait_time)
+            except asyncio.TimeoutError:
+                # 超时处理
+                logger.warning(f"⚠️ 任务等待超时，已等待 {max_wait_time} 秒")
+                return f"任务等待超时，部分任务可能仍在执行"
+
+            state = ctx.session.state
+            planning_triggered = state.get('planning_trigger', False)
+            if planning_triggered:
+                state['planning_trigger'] = False
+
+            # 检查所有委托任务是否完成
+            if not self._pending_ids:
+                if self._failed_ids:
+                    failed = sorted(self._failed_ids)
+                    logger.warning(f"⚠️ 任务执行结束，失败任务: {failed}")
+                    return f"任务执行结束，失败任务: {failed}"
+                logger.info("✅ 所有任务完成")
+                return "所有任务完成"
+
+            # 检查是否有规划触发器
+            logger.info("🚀 检测到规划触发器，立即启动下一轮")
+            return "检测到任务完成，触发下一轮规划"
+
         except Exception as e:
             logger.error(f"❌ 等待任务完成失败: {e}")
             return f"❌ 等待任务完成失败: {e}"
 
-    async def _generate_meta_tasks(self, ctx: InvocationContext) -> List[Dict[str, Any]]:
+    def notify_task_completed(self, task_id: str):
+        """卫星智能体写入任务结果后调用，所有任务完成时唤醒等待方"""
+        self._pending_ids.discard(task_id)
+        if not self._pending_ids:
+            self._completion_event.set()
+
+    def notify_task_failed(self, task_id: str):
+        """任务执行失败、不会再写入结果时调用（对已完成的任务无影响）"""
+        if task_id in self._pending_ids:
+            self._failed_ids.add(task_id)
+            self.notify_task_completed(task_id)
+
+    def notify_planning_trigger(self):
+        """卫星智能体设置规划触发器后调用，唤醒等待方"""
+        # 直接分派时按任务ID精确跟踪完成情况，单个卫星的规划触发不提前结束等待
+        if not self._dispatched_directly:
+            self._completion_event.set()
+
+    async def _generate_meta_tasks(self, ctx: InvocationContext) -> List[MetaTask]:
         """生成元任务（简化版）"""
         try:
             # 模拟元任务生成
+            cycle = self._planning_cycle
             meta_tasks = [
-                {
-                    'task_id': f"task_{self._planning_cycle}_{i}",
-                    'description': f"第{self._planning_cycle}轮任务{i+1}",
-                    'priority': 0.8,
-                    'target_count': 1
-                }
+                MetaTask(f"task_{cycle}_{i}", f"第{cycle}轮任务{i+1}", 0.8, 1)
                 for i in range(2)  # 每轮生成2个任务
             ]
             
@@ -290,6 +490,7 @@ class ADKTransferOptimizedScheduler(LlmAgent):
     def stop_planning(self):
         """停止滚动规划"""
         self._is_running = False
+        self._cancel_dispatch_tasks()
         logger.info("🛑 滚动规划已停止")
 
 
@@ -325,43 +526,16 @@ class ADKTransferOptimizedSatellite(LlmAgent):
 
         # 任务执行状态
         object.__setattr__(self, '_current_task', None)
-        object.__setattr__(self, '_task_history', [])
+        # 任务历史只保留最近的记录（可通过config['history_size']配置），避免长时间运行时无限增长
+        object.__setattr__(
+            self, '_task_history', collections.deque(maxlen=self.config.get('history_size', 512))
+        )
 
         logger.info(f"🛰️ 优化卫星智能体 {satellite_id} 初始化完成")
 
     def _build_satellite_instruction(self, satellite_id: str) -> str:
         """构建卫星智能体指令"""
-        return f"""
-你是卫星 {satellite_id} 智能体，负责执行委托的任务。
-
-当接收到任务委托时，你需要：
-1. 分析任务需求和约束条件
-2. 执行必要的计算（如可见性计算、轨道分析等）
-3. 如果是协同任务，创建讨论组与其他卫星协作
-4. 将执行结果保存到session.state中
-5. 设置规划触发器启动下一轮规划
-
-任务执行流程：
-1. 接收任务 -> 分析任务类型和需求
-2. 单独执行 -> 直接计算并返回结果
-3. 协同执行 -> 创建讨论组，协调其他卫星
-4. 结果保存 -> session.state['task_results'][task_id] = 结果
-5. 触发规划 -> session.state['planning_trigger'] = True
-
-结果格式：
-{{
-    "task_id": "任务ID",
-    "satellite_id": "{satellite_id}",
-    "execution_time": "执行时间",
-    "result_type": "single|collaborative",
-    "result_data": {{
-        "success": true/false,
-        "details": "详细结果",
-        "metrics": {{"gdop": 值, "coverage": 值}}
-    }},
-    "discussion_group_id": "讨论组ID（如果有）"
-}}
-"""
+        return _SATELLITE_INSTRUCTION_TMPL.format_map({'satellite_id': satellite_id})
 
     async def _run_async_impl(self, ctx: InvocationContext) -> AsyncGenerator[Event, None]:
         """
@@ -392,45 +566,56 @@ class ADKTransferOptimizedSatellite(LlmAgent):
                 actions=EventActions(escalate=True)
             )
 
+    def _get_scheduler(self) -> Optional[ADKTransferOptimizedScheduler]:
+        """获取作为父智能体的优化调度器（不是该调度器的子智能体时返回None）"""
+        parent = getattr(self, 'parent_agent', None)
+        return parent if isinstance(parent, ADKTransferOptimizedScheduler) else None
+
     async def _execute_delegated_tasks(
         self,
         ctx: InvocationContext,
         delegation_info: Dict[str, Any]
     ) -> AsyncGenerator[Event, None]:
         """执行委托的任务"""
+        meta_tasks: List[MetaTask] = []
         try:
-            meta_tasks = delegation_info.get('meta_tasks', [])
+            # 经session.state传递的元任务为dict，直接分派时为MetaTask
+            meta_tasks = [
+                task if isinstance(task, MetaTask) else MetaTask.from_state(task)
+                for task in delegation_info.get('meta_tasks', [])
+            ]
 
             yield Event(
                 author=self.name,
                 content=types.Content(parts=[types.Part(text=f"📋 接收到 {len(meta_tasks)} 个委托任务")])
             )
 
-            # 执行每个任务
-            for task in meta_tasks:
-                task_id = task.get('task_id')
+            # 并发执行所有任务，结果先收集到本地
+            results = await asyncio.gather(*(self._execute_single_task(ctx, task) for task in meta_tasks))
+            local_results = {task.task_id: result for task, result in zip(meta_tasks, results)}
 
-                yield Event(
-                    author=self.name,
-                    content=types.Content(parts=[types.Part(text=f"🔄 开始执行任务: {task_id}")])
-                )
+            # 一次性保存结果到session.state
+            state = ctx.session.state
+            task_results = state.get('task_results', {})
+            task_results.update(local_results)
+            state['task_results'] = task_results
 
-                # 执行任务
-                task_result = await self._execute_single_task(ctx, task)
+            # 通知调度器任务已完成
+            scheduler = self._get_scheduler()
+            if scheduler is not None:
+                for task_id in local_results:
+                    scheduler.notify_task_completed(task_id)
 
-                # 保存结果到session.state
-                if 'task_results' not in ctx.session.state:
-                    ctx.session.state['task_results'] = {}
-
-                ctx.session.state['task_results'][task_id] = task_result
-
-                yield Event(
-                    author=self.name,
-                    content=types.Content(parts=[types.Part(text=f"✅ 任务完成: {task_id}")])
-                )
+            yield Event(
+                author=self.name,
+                content=types.Content(parts=[types.Part(text=f"✅ 任务完成: {list(local_results)}")])
+            )
 
             # 触发下一轮规划
             ctx.session.state['planning_trigger'] = True
+            scheduler = self._get_scheduler()
+            if scheduler is not None:
+                scheduler.notify_planning_trigger()
 
             yield Event(
                 author=self.name,
@@ -440,16 +625,21 @@ class ADKTransferOptimizedSatellite(LlmAgent):
 
         except Exception as e:
             logger.error(f"❌ 执行委托任务失败: {e}")
+            # 通知调度器未写入结果的任务已失败，避免调度器等待超时
+            scheduler = self._get_scheduler()
+            if scheduler is not None:
+                for task in meta_tasks:
+                    scheduler.notify_task_failed(task.task_id)
             yield Event(
                 author=self.name,
                 content=types.Content(parts=[types.Part(text=f"❌ 执行委托任务失败: {e}")])
             )
 
-    async def _execute_single_task(self, ctx: InvocationContext, task: Dict[str, Any]) -> Dict[str, Any]:
+    async def _execute_single_task(self, ctx: InvocationContext, task: MetaTask) -> Dict[str, Any]:
         """执行单个任务"""
+        task_id = task.task_id
         try:
-            task_id = task.get('task_id')
-            task_description = task.get('description', '')
+            task_description = task.description
 
             logger.info(f"🔄 卫星 {self.satellite_id} 执行任务: {task_id}")
 
@@ -482,7 +672,7 @@ class ADKTransferOptimizedSatellite(LlmAgent):
         except Exception as e:
             logger.error(f"❌ 卫星 {self.satellite_id} 任务执行失败: {e}")
             return {
-                "task_id": task.get('task_id'),
+                "task_id": task_id,
                 "satellite_id": self.satellite_id,
                 "execution_time": datetime.now().isoformat(),
                 "result_type": "single",
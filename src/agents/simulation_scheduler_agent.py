@@ -6,6 +6,7 @@
 import logging
 import asyncio
 import json
+import time
 from datetime import datetime, timedelta
 from typing import Dict, List, Any, Optional, AsyncGenerator
 from pathlib import Path
@@ -451,6 +452,8 @@ class SimulationSchedulerAgent(LlmAgent):
             self._pending_tasks = set()  # 待完成的任务ID集合
             self._completed_tasks = {}   # 已完成的任务结果
             self._waiting_for_tasks = False  # 是否正在等待任务完成
+            self._tasks_condition = None       # 任务完成通知条件，唤醒等待方（按事件循环惰性创建）
+            self._tasks_condition_loop = None  # 条件变量所绑定的事件循环
 
             # 注册任务完成通知回调
             self._register_task_completion_callback()
@@ -890,9 +893,27 @@ class SimulationSchedulerAgent(LlmAgent):
                 # 发送UI通知
                 self._send_ui_log("✅ 所有任务已完成，准备开始下一轮规划")
 
+            # 唤醒等待任务完成的协程
+            tasks_condition = self._get_tasks_condition()
+            async with tasks_condition:
+                tasks_condition.notify_all()
+
         except Exception as e:
             logger.error(f"❌ 处理任务完成通知失败: {e}")
 
+    def _get_tasks_condition(self) -> asyncio.Condition:
+        """
+        获取绑定当前事件循环的任务完成条件变量
+
+        UI每次请求都会在新的事件循环中运行同一个调度器实例，
+        条件变量只能在创建它的事件循环中使用，因此事件循环变化时重新创建
+        """
+        loop = asyncio.get_running_loop()
+        if self._tasks_condition is None or self._tasks_condition_loop is not loop:
+            self._tasks_condition = asyncio.Condition()
+            self._tasks_condition_loop = loop
+        return self._tasks_condition
+
     async def _wait_for_all_tasks_completion(self):
         """等待所有任务完成"""
         try:
@@ -907,23 +928,32 @@ class SimulationSchedulerAgent(LlmAgent):
             # 发送UI通知
             self._send_ui_log(f"⏳ 等待 {len(self._pending_tasks)} 个任务完成...")
 
-            # 等待所有任务完成，最多等待15分钟
-            max_wait_time = 900  # 15分钟
-            check_interval = 5   # 每5秒检查一次
+            # 等待所有任务完成，最多等待15分钟；任务完成回调通过条件变量唤醒
+            max_wait_time = 900      # 15分钟
+            progress_interval = 30   # 每30秒显示一次进度
+            start_time = time.monotonic()
             total_wait_time = 0
 
-            while total_wait_time < max_wait_time and len(self._pending_tasks) > 0:
-                await asyncio.sleep(check_interval)
-                total_wait_time += check_interval
+            tasks_condition = self._get_tasks_condition()
+            async with tasks_condition:
+                while total_wait_time < max_wait_time and len(self._pending_tasks) > 0:
+                    try:
+                        await asyncio.wait_for(
+                            tasks_condition.wait_for(lambda: len(self._pending_tasks) == 0),
+                            timeout=min(progress_interval, max_wait_time - total_wait_time)
+                        )
+                    except asyncio.TimeoutError:
+                        pass
+                    total_wait_time = int(time.monotonic() - start_time)
 
-                # 显示等待进度
-                if total_wait_time % 30 == 0:  # 每30秒显示一次进度
-                    remaining_tasks = len(self._pending_tasks)
-                    completed_tasks = len(self._completed_tasks)
+                    # 显示等待进度
+                    if len(self._pending_tasks) > 0:
+                        remaining_tasks = len(self._pending_tasks)
+                        completed_tasks = len(self._completed_tasks)
 
-                    progress_msg = f"⏳ 等待中... 剩余任务: {remaining_tasks}, 已完成: {completed_tasks}, 已等待: {total_wait_time}s"
-                    logger.info(progress_msg)
-                    self._send_ui_log(progress_msg)
+                        progress_msg = f"⏳ 等待中... 剩余任务: {remaining_tasks}, 已完成: {completed_tasks}, 已等待: {total_wait_time}s"
+                        logger.info(progress_msg)
+                        self._send_ui_log(progress_msg)
 
             # 检查等待结果
             if len(self._pending_tasks) == 0:
@@ -0,0 +1,157 @@
+"""
+ADK transfer优化调度器测试用例
+验证直接分派、卫星事件转发、完成事件等待及失败/取消处理
+"""
+
+import unittest
+import asyncio
+import sys
+from pathlib import Path
+
+# 添加项目根目录到Python路径
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.agents.adk_transfer_optimization import (
+    ADKTransferOptimizedScheduler,
+    ADKTransferOptimizedSatellite,
+    MetaTask,
+)
+
+
+class _FakeSession:
+    """仅提供state的会话替身"""
+
+    def __init__(self):
+        self.state = {}
+
+
+class _FakeContext:
+    """调度器与卫星只使用session.state及model_copy的调用上下文替身"""
+
+    def __init__(self, session=None, agent=None):
+        self.session = session or _FakeSession()
+        self.agent = agent
+
+    def model_copy(self, update=None):
+        return _FakeContext(self.session, (update or {}).get('agent', self.agent))
+
+
+def _make_scheduler(satellite_count=2):
+    satellites = [ADKTransferOptimizedSatellite(f"SAT_{i}") for i in range(satellite_count)]
+    return ADKTransferOptimizedScheduler(satellites), satellites
+
+
+def _make_tasks(count, cycle=1):
+    return [MetaTask(f"task_{cycle}_{i}", f"任务{i}", 0.5 + i * 0.1, 1) for i in range(count)]
+
+
+async def _collect(agen):
+    return [event async for event in agen]
+
+
+class TestDirectDispatch(unittest.IsolatedAsyncioTestCase):
+    """直接分派测试类"""
+
+    def test_assign_tasks_balances_load(self):
+        """任务按负载均衡分配，高优先级任务先分配"""
+        scheduler, satellites = _make_scheduler(2)
+        tasks = _make_tasks(4)
+
+        assignments = scheduler._assign_tasks(tasks)
+
+        self.assertEqual([len(assigned) for _, assigned in assignments], [2, 2])
+        assigned_ids = [task.task_id for _, assigned in assignments for task in assigned]
+        self.assertCountEqual(assigned_ids, [task.task_id for task in tasks])
+        # 优先级最高的任务分配给第一个卫星
+        self.assertEqual(assignments[0][1][0].task_id, "task_1_3")
+
+    async def test_dispatch_yields_satellite_events_and_completes(self):
+        """直接分派时调度器转发卫星事件，所有任务完成后等待立即返回"""
+        scheduler, satellites = _make_scheduler(2)
+        ctx = _FakeContext()
+        tasks = _make_tasks(3)
+
+        await scheduler._delegate_tasks_with_transfer(ctx, tasks)
+        self.assertTrue(scheduler._dispatched_directly)
+
+        events = await _collect(scheduler._run_dispatched_satellites(ctx))
+        authors = {event.author for event in events}
+        self.assertEqual(authors, {satellite.name for satellite in satellites})
+
+        result = await asyncio.wait_for(scheduler._wait_for_task_completion(ctx), timeout=1)
+        self.assertEqual(result, "所有任务完成")
+        self.assertCountEqual(ctx.session.state['task_results'], [task.task_id for task in tasks])
+
+    async def test_failed_satellite_releases_waiter(self):
+        """卫星执行失败时任务按失败处理，等待方不必等到超时"""
+        scheduler, satellites = _make_scheduler(1)
+        ctx = _FakeContext()
+
+        async def _failing_gather(*args, **kwargs):
+            raise RuntimeError("模拟计算失败")
+
+        object.__setattr__(satellites[0], '_execute_single_task', _failing_gather)
+
+        await scheduler._delegate_tasks_with_transfer(ctx, _make_tasks(2))
+        await _collect(scheduler._run_dispatched_satellites(ctx))
+
+        result = await asyncio.wait_for(scheduler._wait_for_task_completion(ctx), timeout=1)
+        self.assertIn("失败任务", result)
+        self.assertEqual(scheduler._failed_ids, {"task_1_0", "task_1_1"})
+
+    async def test_closing_dispatch_cancels_satellite_tasks(self):
+        """关闭事件流时取消仍在执行的卫星任务，并释放等待方"""
+        scheduler, satellites = _make_scheduler(1)
+        ctx = _FakeContext()
+
+        async def _slow_task(ctx, task):
+            await asyncio.sleep(60)
+
+        object.__setattr__(satellites[0], '_execute_single_task', _slow_task)
+
+        await scheduler._delegate_tasks_with_transfer(ctx, _make_tasks(1))
+        events = scheduler._run_dispatched_satellites(ctx)
+        await events.__anext__()  # 接收到委托任务的事件
+        dispatch_tasks = list(scheduler._dispatch_tasks)
+        await events.aclose()
+        await asyncio.gather(*dispatch_tasks, return_exceptions=True)
+
+        self.assertTrue(all(task.cancelled() for task in dispatch_tasks))
+        self.assertFalse(scheduler._dispatch_tasks)
+        self.assertFalse(scheduler._pending_ids)
+        self.assertEqual(scheduler._failed_ids, {"task_1_0"})
+
+    async def test_state_tasks_tolerate_extra_and_missing_keys(self):
+        """经session.state传递的任务dict含多余字段或缺少字段时，整批任务仍正常执行"""
+        scheduler, satellites = _make_scheduler(1)
+        ctx = _FakeContext(agent=satellites[0])
+        delegation_info = {
+            'meta_tasks': [
+                {'task_id': "task_extra", 'description': "任务", 'priority': 0.9,
+                 'target_count': 1, 'assigned_satellite': "SAT_0"},
+                {'task_id': "task_missing"},
+            ]
+        }
+
+        events = await _collect(satellites[0]._execute_delegated_tasks(ctx, delegation_info))
+
+        self.assertCountEqual(ctx.session.state['task_results'], ["task_extra", "task_missing"])
+        self.assertNotIn("失败", "".join(part.text for event in events for part in event.content.parts))
+
+    async def test_planning_trigger_does_not_end_direct_wait_early(self):
+        """直接分派时单个卫星的规划触发不会提前结束等待"""
+        scheduler, _ = _make_scheduler(2)
+        ctx = _FakeContext()
+
+        await scheduler._delegate_tasks_with_transfer(ctx, _make_tasks(2))
+        scheduler.notify_planning_trigger()
+        self.assertFalse(scheduler._completion_event.is_set())
+
+        for task_id in list(scheduler._pending_ids):
+            scheduler.notify_task_completed(task_id)
+        self.assertTrue(scheduler._completion_event.is_set())
+
+
+if __name__ == "__main__":
+    unittest.main()
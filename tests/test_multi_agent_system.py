@@ -9,6 +9,7 @@ import tempfile
 import shutil
 from pathlib import Path
 from datetime import datetime, timedelta
+from types import SimpleNamespace
 import sys
 
 # 添加项目根目录到Python路径
@@ -81,7 +82,32 @@ class TestMultiAgentSystem(unittest.TestCase):
             
         except Exception as e:
             self.fail(f"仿真调度智能体测试失败: {e}")
-    
+
+    def test_task_completion_wait_across_event_loops(self):
+        """测试同一调度器在不同事件循环中等待任务完成（UI每次请求使用新的事件循环）"""
+        agent = SimulationSchedulerAgent(
+            name="TestScheduler",
+            model="mock-model"
+        )
+
+        async def wait_for_one_task(task_id):
+            agent._pending_tasks.add(task_id)
+
+            async def complete_later():
+                await asyncio.sleep(0.01)
+                await agent._on_task_completed(
+                    SimpleNamespace(task_id=task_id, status='completed', quality_score=1.0)
+                )
+
+            completion = asyncio.create_task(complete_later())
+            await asyncio.wait_for(agent._wait_for_all_tasks_completion(), timeout=5)
+            await completion
+
+        for task_id in ("task_loop_1", "task_loop_2"):
+            asyncio.run(wait_for_one_task(task_id))
+            self.assertFalse(agent._pending_tasks)
+            self.assertIn(task_id, agent._completed_tasks)
+
     def test_satellite_agent(self):
         """测试卫星智能体"""
         try: